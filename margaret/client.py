@@ -7,7 +7,7 @@
 
 import logging
 import time
-from threading import BoundedSemaphore
+from threading import Condition
 import socketio
 from margaret import siobus
 
@@ -29,22 +29,23 @@ class Client:
         self.bus = siobus.BusWorker(self.host, self.port)
         self.bus.set_namespace(self.namespace)
         self.buffer = options.get('buffer', 5)
-        self._semaphore = BoundedSemaphore(self.buffer)
+        # transmission permits guarded by one condition variable
+        self._cv = Condition()
+        self._permits = self.buffer
         self.on_default()
 
     def _semaphore_all_release(self):
-        while self._semaphore._value < self.buffer:
-            self._semaphore.release()
-
-    def _semaphore_set(self):
-        self._semaphore_all_release()
-        self._semaphore = BoundedSemaphore(self.buffer)
+        with self._cv:
+            self._permits = self.buffer
+            self._cv.notify_all()
 
     def change_buffer(self, buf):
         """Change buffer size."""
         if isinstance(buf, int):
-            self.buffer = buf
-            self._semaphore_set()
+            with self._cv:
+                self.buffer = buf
+                self._permits = buf
+                self._cv.notify_all()
             return True
         return False
 
@@ -70,10 +71,12 @@ class Client:
     def dec_sync_count_down(self, func):
         """Dec_sync_regist."""
         def new_func(*args, **kwargs):
-            try:
-                self._semaphore.release()
-            except ValueError:
-                LOGGER.warn("semaphore release exceeds acquire.")
+            with self._cv:
+                if self._permits < self.buffer:
+                    self._permits += 1
+                    self._cv.notify()
+                else:
+                    LOGGER.warning("permit release exceeds acquire.")
             return func(*args, **kwargs)
         return new_func
 
@@ -100,7 +103,10 @@ class Client:
         The number of simultaneous transmissions can
         be set with self.buffer.
         """
-        self._semaphore.acquire()
+        with self._cv:
+            while self._permits <= 0:
+                self._cv.wait()
+            self._permits -= 1
         self.bus.emit(event,
                       data,
                       namespace=namespace)
@@ -9,9 +9,11 @@
 import sys
 import threading
 import time
+import itertools
+import heapq
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import logging
-import queue
 
 # LOGGER
 LOGGER = logging.getLogger(__name__)
@@ -19,27 +21,11 @@ LOGGER = logging.getLogger(__name__)
 # Computer job format
 Job = namedtuple('Job', ['chain', 'work', "data"])
 
-class PriorityItem:
-    """Priority queue item.
+# Minimum interval between progress messages [ns]
+PRINT_INTERVAL_NS = 100_000_000
 
-    This is helper class of priority queue.
-    """
-
-    def __init__(self, elem_to_wrap, priority):
-        """Init."""
-        self.job = elem_to_wrap
-        self.priority = priority
-        self.time = time.time()
-
-    def __lt__(self, other):
-        """Comparison order."""
-        if self.priority < other.priority:
-            return True
-
-        if self.time < other.time:
-            return True
-
-        return False
+# Maximum number of jobs drained from the heap per wakeup
+DRAIN_BATCH = 16
 
 
 class Computer(threading.Thread):
@@ -59,21 +45,55 @@ class Computer(threading.Thread):
     }
     """
 
-    def __init__(self, compute_model, callbacks=None):
-        """Init."""
+    def __init__(self, compute_model, callbacks=None, max_workers=1):
+        """Init.
+
+        max_workers > 1 dispatches jobs to a thread pool so that
+        _compute calls run concurrently. This is opt-in: job ordering
+        is only guaranteed with max_workers=1, so the compute model
+        must be stateless (or release the GIL) to benefit.
+        """
         super(Computer, self).__init__()
         self.setDaemon(True)
 
         # model is required
         self.compute_model = compute_model
 
+        # optional worker pool
+        self._pool = None
+        if max_workers > 1:
+            self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+        # bound method cache for job dispatch
+        self._dispatch = {}
+
+        # allow-list of submittable work names, resolved once so the
+        # per-submission check is a set membership test
+        self._valid_works = frozenset(
+            name for name in dir(compute_model)
+            if not name.startswith("_")
+            and callable(getattr(compute_model, name)))
+
         # computer internal variable
         self.__datacnt = 0
+        self._last_print_ns = 0
 
         # queue
-        self.__q = queue.PriorityQueue()
+        # Entries are (priority, sequence, job) tuples on a bare heap;
+        # the sequence counter breaks priority ties in submission
+        # order. A single condition variable replaces PriorityQueue's
+        # extra lock/condition layering.
+        self._heap = []
+        self._cv = threading.Condition()
+        self._seq = itertools.count()
 
         # callbacks
+        # Known events also get a per-event attribute so hot call
+        # sites test a pointer instead of probing the dict.
+        self._cb_fetch = None
+        self._cb_writeback = None
+        self._cb_accept = None
+        self._cb_reject = None
         self.callbacks = {}
         if isinstance(callbacks, dict):
             for name in callbacks:
@@ -94,14 +114,25 @@ class Computer(threading.Thread):
         return self._handler(self.callbacks[event], *args)
 
     def _compute(self, job):
-        return getattr(self.compute_model, job.work)(job.data)
+        func = self._dispatch.get(job.work)
+        if func is None:
+            func = getattr(self.compute_model, job.work)
+            self._dispatch[job.work] = func
+        return func(job.data)
 
 
     def _print_message(self, process_time, addtext=""):
+        # Rate limit the progress line; a write+flush per job
+        # dominates the per-job cost at high IOPS.
+        now = time.monotonic_ns()
+        if now - self._last_print_ns < PRINT_INTERVAL_NS:
+            return None
+        self._last_print_ns = now
+
         iops = 1.0 / process_time
-        message = ("\r({0}/{1}) in {2:.2f}s ({3:.2f} IOPS) {4} "
-                   .format(self.__datacnt, self.__q.qsize() + self.__datacnt,
-                           process_time, iops, addtext))
+        total = len(self._heap) + self.__datacnt
+        message = (f"\r({self.__datacnt}/{total}) in {process_time:.2f}s"
+                   f" ({iops:.2f} IOPS) {addtext} ")
         sys.stdout.write(message)
         sys.stdout.flush()
         return message
@@ -139,14 +170,28 @@ class Computer(threading.Thread):
 
         return (output, machine_info)
 
+    def _pool_writeback(self, future):
+        try:
+            output, machine_info = future.result()
+        except Exception:
+            LOGGER.exception("Pooled job failed.")
+            return
+        callback = self._cb_writeback
+        if output is not None and callback is not None:
+            callback(output, machine_info)
+
     def _check_job(self, data, work):
         if work is not None:
             if not isinstance(work, str):
                 return False
 
+            if work in self._valid_works:
+                return True
+
             if work.startswith("_"):
                 return False
 
+            # fall back to reflection for methods added after init
             if not callable(getattr(self.compute_model, work, None)):
                 return False
 
@@ -160,6 +205,7 @@ class Computer(threading.Thread):
             return False
 
         self.callbacks[event] = callback
+        setattr(self, "_cb_" + event, callback)
 
         return True
 
@@ -167,11 +213,17 @@ class Computer(threading.Thread):
         """Add_queue, when check_job() return True."""
         if self._check_job(data, work):
             job = Job(chain, work, data)
-            self.__q.put(PriorityItem(job, priority))
-            self._trigger_event("accept")
+            with self._cv:
+                heapq.heappush(self._heap, (priority, next(self._seq), job))
+                self._cv.notify()
+            callback = self._cb_accept
+            if callback is not None:
+                callback()
             return True
 
-        self._trigger_event("reject")
+        callback = self._cb_reject
+        if callback is not None:
+            callback()
         return False
 
 
@@ -186,9 +238,23 @@ class Computer(threading.Thread):
             self.add_queue(None, "loop", "loop", priority=2)
 
         while True:
-            next_queue = self.__q.get(block=True).job
-            self._trigger_event("fetch", next_queue)
-            output, machine_info = self._exec_queue(next_queue)
-            if output is not None:
-                self._trigger_event("writeback", output, machine_info)
-            self.__q.task_done()
+            # drain up to DRAIN_BATCH ready jobs per lock cycle
+            batch = []
+            with self._cv:
+                while not self._heap:
+                    self._cv.wait()
+                while self._heap and len(batch) < DRAIN_BATCH:
+                    batch.append(heapq.heappop(self._heap)[2])
+
+            for next_queue in batch:
+                callback = self._cb_fetch
+                if callback is not None:
+                    callback(next_queue)
+                if self._pool is not None:
+                    future = self._pool.submit(self._exec_queue, next_queue)
+                    future.add_done_callback(self._pool_writeback)
+                    continue
+                output, machine_info = self._exec_queue(next_queue)
+                callback = self._cb_writeback
+                if output is not None and callback is not None:
+                    callback(output, machine_info)
@@ -0,0 +1,449 @@
+# coding: UTF-8
+# Copyright 2020 Hideto Manjo.
+#
+# Licensed under the MIT License
+
+"""Queueing statistics and encoding tool module."""
+
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is an optional accelerator; the pure Python path below is
+    # used when it is not installed.
+    njit = None
+
+
+def _record(samples, head, count, total, sample):
+    maxlen = samples.shape[0]
+    if count == maxlen:
+        total -= samples[head]
+    else:
+        count += 1
+    samples[head] = sample
+    head = (head + 1) % maxlen
+    total += sample
+    return head, count, total
+
+
+def _bin2uint(vector):
+    acc = 0
+    for i in range(vector.shape[0]):
+        acc = (acc << 1) | (1 if vector[i] != 0 else 0)
+    return acc
+
+
+def _rsquare(measured, estimated):
+    # one fused pass: residual sum of squares plus the moments needed
+    # for the total sum of squares
+    n = measured.shape[0]
+    top = 0.0
+    s_m = 0.0
+    s_mm = 0.0
+    for i in range(n):
+        diff = measured[i] - estimated[i]
+        top += diff * diff
+        s_m += measured[i]
+        s_mm += measured[i] * measured[i]
+    bottom = s_mm - s_m * s_m / n
+    return 1.0 - top / bottom
+
+
+if njit is not None:
+    _record = njit(cache=True)(_record)
+    _bin2uint = njit(cache=True)(_bin2uint)
+    _rsquare = njit(cache=True)(_rsquare)
+
+
+class _RunningSeries:
+    """Running series.
+
+    A fixed length sample series which maintains the running sum of
+    its samples. Samples live in a preallocated ring buffer, so the
+    update is plain index arithmetic (JIT compiled when numba is
+    available) and the mean is derived in O(1) without re-walking the
+    samples.
+    """
+
+    def __init__(self, maxlen=100):
+        """Init."""
+        self._samples = np.zeros(maxlen, dtype=np.int64)
+        self._head = 0
+        self._count = 0
+        self._sum = 0
+
+    def __len__(self):
+        """Return the number of samples."""
+        return self._count
+
+    @property
+    def sum(self):
+        """Return the running sum of the samples."""
+        return self._sum
+
+    def append(self, sample):
+        """Append a sample, evicting the oldest when full."""
+        self._head, self._count, self._sum = _record(
+            self._samples, self._head, self._count, self._sum, sample)
+
+    def mean(self):
+        """Return the mean of the samples in O(1)."""
+        if self._count == 0:
+            return 0.0
+        return self._sum / self._count
+
+    def samples(self):
+        """Return the samples in arrival order.
+
+        The contiguous ring buffer makes this two slice views plus one
+        concatenate, so batched statistics (std, percentile, ...) can
+        run over it at C speed.
+        """
+        if self._count < self._samples.shape[0]:
+            return self._samples[:self._count].copy()
+        head = self._head
+        return np.concatenate((self._samples[head:], self._samples[:head]))
+
+    def clear(self):
+        """Clear samples."""
+        self._head = 0
+        self._count = 0
+        self._sum = 0
+
+
+# per-size pool of zeroed float32 work buffers
+_POOL = defaultdict(list)
+
+
+def _acquire(width):
+    """Fetch a zeroed float32 buffer of the given width from the pool."""
+    pool = _POOL[width]
+    if pool:
+        return pool.pop()
+    return np.zeros(width, dtype=np.float32)
+
+
+def _release(buffer):
+    """Zero a buffer and return it to the pool."""
+    buffer.fill(0)
+    _POOL[buffer.shape[0]].append(buffer)
+
+
+@contextmanager
+def pooled(width):
+    """Context manager yielding a pooled zeroed float32 buffer.
+
+    Encoder loops that need a private writable vector per iteration
+    borrow it here instead of calling np.zeros per call; the buffer
+    goes back to the pool on exit, so a steady minibatch loop reuses
+    the same few allocations.
+    """
+    buffer = _acquire(width)
+    try:
+        yield buffer
+    finally:
+        _release(buffer)
+
+
+# cached identity matrices shared by the one-hot helpers
+_EYE_CACHE = {}
+
+
+def _get_eye(width):
+    eye = _EYE_CACHE.get(width)
+    if eye is None:
+        eye = np.eye(width, dtype=np.float32)
+        eye.setflags(write=False)
+        _EYE_CACHE[width] = eye
+    return eye
+
+
+class Tool:
+    """Encoding utility functions.
+
+    The one-hot helpers index a cached identity matrix instead of
+    allocating and zero-filling a fresh vector per call. The returned
+    rows are read-only views; callers that mutate the result must
+    copy it.
+    """
+
+    @staticmethod
+    def uint2hot(number, width):
+        """Return the one-hot float32 vector of an unsigned int."""
+        return _get_eye(width)[int(number)]
+
+    @staticmethod
+    def int2hot(number, width):
+        """Return the one-hot float32 vector of a signed int.
+
+        The value is offset by width // 2, so the representable range
+        is [-width // 2, width - width // 2).
+        """
+        return _get_eye(width)[int(number) + width // 2]
+
+    @staticmethod
+    def uint2hot_into(out, number):
+        """Write the one-hot vector of an unsigned int into out."""
+        out.fill(0)
+        out[int(number)] = 1.0
+        return out
+
+    @staticmethod
+    def int2hot_into(out, number):
+        """Write the one-hot vector of a signed int into out."""
+        out.fill(0)
+        out[int(number) + out.shape[0] // 2] = 1.0
+        return out
+
+    @staticmethod
+    def arg2hot(vector):
+        """Return the one-hot float32 vector of the vector's argmax."""
+        vector = np.asarray(vector)
+        return _get_eye(vector.shape[0])[int(np.argmax(vector))]
+
+    @staticmethod
+    def arg2bin(hotvec, threshold=0.5):
+        """Return the thresholded float32 bit vector of hotvec.
+
+        A single branchless comparison kernel; no index temporaries.
+        """
+        return (np.asarray(hotvec) >= threshold).astype(np.float32)
+
+    @staticmethod
+    def arg2digitize(hotvec, bins):
+        """Return the bin indices of hotvec as a float32 vector."""
+        return np.digitize(hotvec, bins).astype(np.float32)
+
+    @staticmethod
+    def int2bin(number, width):
+        """Return the width-bit two's complement float32 bit vector.
+
+        The number is masked to width bits and unpacked with
+        np.unpackbits, so the whole conversion runs in NumPy C code
+        without a binary string round trip.
+        """
+        masked = int(number) & ((1 << width) - 1)
+        raw = masked.to_bytes((width + 7) // 8, "big")
+        bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8))
+        return bits[-width:].astype(np.float32)
+
+    @staticmethod
+    def bin2uint(vector):
+        """Return the unsigned int encoded by a bit vector.
+
+        The accumulation loop is a scalar shift-or (JIT compiled when
+        numba is available) instead of materializing a power-of-two
+        weight array for np.dot.
+        """
+        return int(_bin2uint(np.ascontiguousarray(vector)))
+
+    @staticmethod
+    def bin2int(vector):
+        """Return the signed int encoded by a two's complement vector."""
+        width = len(vector)
+        value = int(_bin2uint(np.ascontiguousarray(vector)))
+        if value >= 1 << (width - 1):
+            value -= 1 << width
+        return value
+
+    @staticmethod
+    def rsquare(measured_vec, estimated_vec):
+        """Return the coefficient of determination (R^2).
+
+        With numba the residual and total sums of squares accumulate
+        in one fused pass that reads measured_vec once. The fallback
+        uses np.dot reductions, which avoid the temporary squared
+        arrays of the naive np.sum((x) ** 2) formulation.
+        """
+        measured_vec = np.ascontiguousarray(measured_vec,
+                                            dtype=np.float64)
+        estimated_vec = np.ascontiguousarray(estimated_vec,
+                                             dtype=np.float64)
+        if njit is not None:
+            return float(_rsquare(measured_vec, estimated_vec))
+
+        diff = measured_vec - estimated_vec
+        top = np.dot(diff, diff)
+        centered = measured_vec - measured_vec.mean()
+        bottom = np.dot(centered, centered)
+        return float(1.0 - top / bottom)
+
+
+class Cache:
+    """Cache.
+
+    A fixed length history of recent vectors. The ring holds at most
+    maxlen entries, so memory stays bounded however long the stream
+    runs and every lookup is O(1) index arithmetic.
+    """
+
+    __slots__ = ("cache", )
+
+    def __init__(self, maxlen=16):
+        """Init."""
+        self.cache = deque(maxlen=maxlen)
+
+    def __len__(self):
+        """Return the number of cached vectors."""
+        return len(self.cache)
+
+    def diff(self, vec):
+        """Return the difference from the previously cached vector.
+
+        The first call returns a zero difference. The vector is cached
+        once per call; the oldest entry drops out automatically.
+        """
+        prev = self.cache[-1] if self.cache else vec
+        self.cache.append(vec)
+        return vec - prev
+
+    def before(self, vec, n):
+        """Return the vector cached n pushes ago, caching vec.
+
+        Returns vec itself while the history is still shorter than n.
+        """
+        if len(self.cache) > n - 1 and n > 0:
+            previous = self.cache[-n]
+        else:
+            previous = vec
+        self.cache.append(vec)
+        return previous
+
+    def clear(self):
+        """Clear the cached vectors."""
+        self.cache.clear()
+
+
+class Queueing:
+    """Queueing.
+
+    This class records arrival and service events and derives M/M/1
+    queueing metrics from the running means of their intervals.
+    Every metric is O(1) arithmetic because the interval series cache
+    their running sums instead of summing the samples per call.
+
+    Intervals are taken from time.monotonic_ns() and kept as integer
+    nanoseconds, so the running sums stay exact and are immune to wall
+    clock adjustments. Conversion to float seconds happens only at the
+    API boundary.
+    """
+
+    def __init__(self, maxlen=100):
+        """Init."""
+        self._arrivals = _RunningSeries(maxlen)
+        self._services = _RunningSeries(maxlen)
+        self._last_arrival = None
+        self._last_service = None
+
+    @staticmethod
+    def __record(time_list, last_time):
+        now = time.monotonic_ns()
+        if last_time is not None:
+            time_list.append(now - last_time)
+        return now
+
+    def arrival(self):
+        """Record an arrival event."""
+        self._last_arrival = self.__record(self._arrivals,
+                                           self._last_arrival)
+
+    def service(self):
+        """Record a service completion event."""
+        self._last_service = self.__record(self._services,
+                                           self._last_service)
+
+    def clear(self):
+        """Clear all recorded events."""
+        self._arrivals.clear()
+        self._services.clear()
+        self._last_arrival = None
+        self._last_service = None
+
+    def arrival_times(self):
+        """Return the recorded interarrival times [s] as an ndarray."""
+        return self._arrivals.samples() * 1e-9
+
+    def service_times(self):
+        """Return the recorded service times [s] as an ndarray."""
+        return self._services.samples() * 1e-9
+
+    def average_arrival_time(self):
+        """Return the mean interarrival time [s]."""
+        return self._arrivals.mean() * 1e-9
+
+    def average_service_time(self):
+        """Return the mean service time [s]."""
+        return self._services.mean() * 1e-9
+
+    def average_arrival_rate(self):
+        """Return the arrival rate (lambda) [1/s]."""
+        if self._arrivals.sum <= 0:
+            return 0.0
+        return len(self._arrivals) / (self._arrivals.sum * 1e-9)
+
+    def average_service_rate(self):
+        """Return the service rate (mu) [1/s]."""
+        if self._services.sum <= 0:
+            return 0.0
+        return len(self._services) / (self._services.sum * 1e-9)
+
+    def average_utilization(self):
+        """Return the utilization (rho = lambda / mu).
+
+        Computed from the cached sums directly, saving the two rate
+        divisions.
+        """
+        sum_a = self._arrivals.sum
+        len_s = len(self._services)
+        if sum_a <= 0 or len_s == 0:
+            return 0.0
+        return (self._services.sum * len(self._arrivals)) / (sum_a * len_s)
+
+    def average_wait(self):
+        """Return the mean queue length (Lq)."""
+        rho = self.average_utilization()
+        if rho >= 1.0:
+            return float("inf")
+        return rho * rho / (1.0 - rho)
+
+    def average_wait_time(self):
+        """Return the mean waiting time (Wq) [s]."""
+        t_s = self.average_service_time()
+        rho = self.average_utilization()
+        if rho >= 1.0:
+            return float("inf")
+        return rho * t_s / (1.0 - rho)
+
+    def turnaround_time(self):
+        """Return the mean turnaround time (W) [s]."""
+        t_s = self.average_service_time()
+        rho = self.average_utilization()
+        if rho >= 1.0:
+            return float("inf")
+        return t_s / (1.0 - rho)
+
+
+if __name__ == "__main__":
+    # Module test
+    # Please run below command for module testing.
+    # python -m margaret.core.algorithm
+    #
+
+    Q = Queueing()
+    for _ in range(10):
+        Q.arrival()
+        time.sleep(0.001)
+        Q.service()
+        time.sleep(0.001)
+    print("-TEST-")
+    print("arrival rate: {0:.2f}".format(Q.average_arrival_rate()))
+    print("service rate: {0:.2f}".format(Q.average_service_rate()))
+    print("utilization : {0:.2f}".format(Q.average_utilization()))
+    print("wait        : {0:.2f}".format(Q.average_wait()))
+    print("wait time   : {0:.4f}".format(Q.average_wait_time()))
+    print("turnaround  : {0:.4f}".format(Q.turnaround_time()))
@@ -5,6 +5,7 @@
 
 """Cell module."""
 import threading
+import queue
 from margaret.core.memory import VirtualMemory
 from margaret.core.netvm import NetVM
 
@@ -16,9 +17,14 @@ class Cell(threading.Thread):
     the execution timing of the input / output of the DNN model.
     These two operations can be performed separately, so the cell can pr
     ocess the data asynchronously.
+
+    With pipelined=True the writeback and send steps run on their own
+    stage threads, so the model execution of trigger N+1 overlaps the
+    host side post-processing and network send of trigger N. The cost
+    per trigger then approaches max(stage times) instead of their sum.
     """
 
-    def __init__(self, model):
+    def __init__(self, model, pipelined=False):
         """Init."""
         super(Cell, self).__init__()
         self.setDaemon(True)
@@ -26,29 +32,34 @@ class Cell(threading.Thread):
         self.source = VirtualMemory(1)
         self.drain = VirtualMemory(1)
         self._gate = threading.Event()
-        self._lock = None
+        self._done = threading.Event()
         self._exit = False
         self._model = model
         self._fetch = None
         self._writeback = None
         self._send = None
+        self._pipelined = pipelined
+        self._post_q = None
+        self._send_q = None
+        self._pipeline = ()
+        self._rebuild_pipeline()
 
-    def _internal_block(self):
-        if self._lock is None:
-            self._lock = threading.Lock()
-            self._lock.acquire(blocking=False)
-            self._lock.acquire(blocking=True)
+    def _rebuild_pipeline(self):
+        """Precompute the fetch/model/writeback call chain.
 
-    def _internal_release(self):
-        if self._lock is not None:
-            self._lock.release()
-            self._lock = None
+        Rebuilt whenever a callback is set, so the run loop applies a
+        flat tuple of callables without per-iteration None checks.
+        """
+        self._pipeline = tuple(
+            func for func in (self._fetch, self._model, self._writeback)
+            if func is not None)
 
     def trigger(self, sync=False):
         """Trigger cell."""
+        self._done.clear()
         self._gate.set()
         if sync:
-            self._internal_block()
+            self._done.wait()
 
     def is_ready(self):
         """Return state of trigger's ready."""
@@ -82,9 +93,11 @@ class Cell(threading.Thread):
         if callable(callback):
             if name == "fetch":
                 self._fetch = callback
+                self._rebuild_pipeline()
                 return True
             elif name == "writeback":
                 self._writeback = callback
+                self._rebuild_pipeline()
                 return True
 
         return False
@@ -103,8 +116,28 @@ class Cell(threading.Thread):
         self.drain.write(0, drain, force=True)
         self._send = lambda: self.drain.send(0, rhost, rport, src_port)
 
-    def run(self):
-        """Start."""
+    def _writeback_stage(self):
+        while True:
+            excute = self._post_q.get()
+            writeback = excute
+            if self._writeback is not None:
+                writeback = self._writeback(excute)
+            self.drain.write(0, writeback)
+            self._send_q.put(None)
+
+    def _send_stage(self):
+        while True:
+            self._send_q.get()
+            if self._send is not None:
+                self._send()
+            self._done.set()
+
+    def _run_pipelined(self):
+        self._post_q = queue.Queue(maxsize=1)
+        self._send_q = queue.Queue(maxsize=1)
+        threading.Thread(target=self._writeback_stage, daemon=True).start()
+        threading.Thread(target=self._send_stage, daemon=True).start()
+
         while not self._exit:
             self._gate.wait()
 
@@ -114,13 +147,28 @@ class Cell(threading.Thread):
 
             excute = self._model(fetch)
 
-            if self._writeback is not None:
-                writeback = self._writeback(excute)
+            # hand off to the post stages and accept the next trigger
+            self._gate.clear()
+            self._post_q.put(excute)
 
-            self.drain.write(0, writeback)
+    def run(self):
+        """Start."""
+        if self._pipelined:
+            self._run_pipelined()
+            return
 
-            if self._send is not None:
-                self._send()
+        while not self._exit:
+            self._gate.wait()
+
+            data = self.source.read(0)
+            for func in self._pipeline:
+                data = func(data)
+
+            self.drain.write(0, data)
+
+            send = self._send
+            if send is not None:
+                send()
 
             self._gate.clear()
-            self._internal_release()
+            self._done.set()
@@ -7,39 +7,112 @@
 This module defines the formats for serializing to communicate between modules.
 """
 
+import struct
+import threading
+
 import numpy as np
 
-# class ListNumpyFormat:
-#     """Numpy ndarray list exchange dict.
-
-#     This class encode or decode list(numpy.ndarray) for speedup.
-#     Since ndarray is sent after stacking, the element shape and dtype
-#     must be the same.
-#     """
-
-#     @staticmethod
-#     def _typecheck(item):
-#         if not isinstance(item, list):
-#             raise TypeError("Type check error.")
-
-#     @staticmethod
-#     def encode(array_list):
-#         """Encode."""
-#         ListNumpyFormat._typecheck(array_list)
-#         array = np.concatenate(array_list)
-#         ret = {
-#             "array": array.tobytes(),
-#             "dtype": str(array.dtype),
-#             "shape": array.shape,
-#             "length": len(array_list),
-#         }
-#         return ret
-
-#     @staticmethod
-#     def decode(item):
-#         """Decode."""
-#         array = np.frombuffer(item["array"], item["dtype"])
-#         return np.array_split(array.reshape(item["shape"]), item["length"], 0)
+# per-thread scratch buffer reused by _tobuffer
+_TLS = threading.local()
+
+
+def _tobuffer(array):
+    """Return the array contents as a bytes-like object.
+
+    Contiguous arrays are wrapped in a memoryview so no copy is made.
+    Non-contiguous arrays are gathered into a per-thread scratch
+    bytearray and returned as an owned bytes copy: the bus transport
+    queues payloads and serializes them on a background thread, so a
+    view of the reused scratch would let the next encode overwrite an
+    in-flight payload. The scratch is purely the gather staging area.
+    """
+    if array.flags["C_CONTIGUOUS"]:
+        return memoryview(array).cast("B")
+
+    nbytes = array.nbytes
+    buf = getattr(_TLS, "buf", None)
+    if buf is None or len(buf) < nbytes:
+        buf = bytearray(nbytes)
+        _TLS.buf = buf
+    view = memoryview(buf)[:nbytes]
+    np.copyto(np.frombuffer(view, dtype=array.dtype).reshape(array.shape),
+              array)
+    return bytes(view)
+
+
+class ListNumpyFormat:
+    """Numpy ndarray list exchange dict.
+
+    This class encode or decode list(numpy.ndarray) for speedup.
+    Since ndarray is sent after stacking, the element shape and dtype
+    must be the same.
+    """
+
+    @staticmethod
+    def _typecheck(item):
+        if not isinstance(item, list):
+            raise TypeError("Type check error.")
+
+    @staticmethod
+    def encode(array_list):
+        """Encode.
+
+        The payload is bytes: the dict is serialized by the
+        transport's JSON packet encoder, which sends only
+        bytes/bytearray as binary attachments. The zero-copy view
+        path lives in encode_oob.
+        """
+        ListNumpyFormat._typecheck(array_list)
+        array = np.concatenate(array_list)
+        ret = {
+            "array": array.tobytes(),
+            "dtype": str(array.dtype),
+            "shape": array.shape,
+            "length": len(array_list),
+        }
+        return ret
+
+    @staticmethod
+    def decode(item):
+        """Decode.
+
+        The encoder concatenates equal shaped elements along axis 0,
+        so the elements are recovered with a single reshape to
+        (length, ...) instead of np.array_split.
+        """
+        length = item["length"]
+        shape = item["shape"]
+        array = np.frombuffer(item["array"], item["dtype"])
+        array = array.reshape((length, shape[0] // length) + tuple(shape[1:]))
+        return list(array)
+
+    @staticmethod
+    def encode_oob(array_list):
+        """Encode into a (meta, buffer) pair.
+
+        The metadata dict stays tiny while the array payload is
+        returned separately as a bytes-like buffer, so transports can
+        send it as one out-of-band binary frame instead of embedding
+        it (and paying base64 expansion) in the serialized dict.
+        np.concatenate always returns a contiguous array, so the
+        buffer is a zero-copy view.
+        """
+        ListNumpyFormat._typecheck(array_list)
+        array = np.concatenate(array_list)
+        meta = {
+            "dtype": str(array.dtype),
+            "shape": array.shape,
+            "length": len(array_list),
+        }
+        return meta, _tobuffer(array)
+
+    @staticmethod
+    def decode_oob(meta, buffer):
+        """Decode a (meta, buffer) pair produced by encode_oob."""
+        item = dict(meta)
+        item["array"] = buffer
+        return ListNumpyFormat.decode(item)
+
 
 class NumpyFormat:
     """Numpy ndarray exchange dict."""
@@ -51,7 +124,11 @@ class NumpyFormat:
 
     @staticmethod
     def encode(array):
-        """Encode."""
+        """Encode.
+
+        The payload is bytes for the same transport reason as
+        ListNumpyFormat.encode; encode_oob keeps the zero-copy view.
+        """
         NumpyFormat._typecheck(array)
         ret = {
             "array": array.tobytes(),
@@ -66,6 +143,70 @@ class NumpyFormat:
         array = np.frombuffer(item["array"], item["dtype"])
         return array.reshape(item["shape"])
 
+    @staticmethod
+    def encode_oob(array):
+        """Encode into a (meta, buffer) pair.
+
+        See ListNumpyFormat.encode_oob.
+        """
+        NumpyFormat._typecheck(array)
+        meta = {
+            "dtype": str(array.dtype),
+            "shape": array.shape,
+        }
+        return meta, _tobuffer(array)
+
+    @staticmethod
+    def decode_oob(meta, buffer):
+        """Decode a (meta, buffer) pair produced by encode_oob."""
+        item = dict(meta)
+        item["array"] = buffer
+        return NumpyFormat.decode(item)
+
+
+class PackedNumpyFormat:
+    """Numpy ndarray exchange bytes with a struct-packed header.
+
+    For fixed-schema messages a small binary header (dtype code, ndim,
+    dims) replaces the exchange dict: the message is one bytes object,
+    and parsing is a struct unpack with no per-message dict or string
+    allocations.
+    """
+
+    DTYPE_CODES = {
+        "<f2": 1, "<f4": 2, "<f8": 3,
+        "|i1": 4, "<i2": 5, "<i4": 6, "<i8": 7,
+        "|u1": 8, "<u2": 9, "<u4": 10, "<u8": 11,
+        "|b1": 12,
+    }
+    _CODE_DTYPES = {code: dtype for dtype, code in DTYPE_CODES.items()}
+
+    @staticmethod
+    def _typecheck(item):
+        if not isinstance(item, np.ndarray):
+            raise TypeError("Type check error.")
+        if item.dtype.str not in PackedNumpyFormat.DTYPE_CODES:
+            raise TypeError("Type check error.")
+
+    @staticmethod
+    def encode(array):
+        """Encode."""
+        PackedNumpyFormat._typecheck(array)
+        header = struct.pack("!BB" + "I" * array.ndim,
+                             PackedNumpyFormat.DTYPE_CODES[array.dtype.str],
+                             array.ndim,
+                             *array.shape)
+        return b"".join((header, _tobuffer(array)))
+
+    @staticmethod
+    def decode(byte_array):
+        """Decode."""
+        code, ndim = struct.unpack_from("!BB", byte_array)
+        shape = struct.unpack_from("!" + "I" * ndim, byte_array, 2)
+        dtype = PackedNumpyFormat._CODE_DTYPES[code]
+        return np.frombuffer(byte_array, dtype,
+                             offset=2 + 4 * ndim).reshape(shape)
+
 
 class NumpyRawFormat:
     """Numpy ndarray exchange bytes."""
@@ -5,7 +5,8 @@
 
 """Virtual memory module."""
 
-from collections import deque
+import struct
+
 import numpy as np
 
 from margaret.core.formats import NumpyFormat
@@ -19,12 +20,17 @@ class VirtualMemory:
     neural network I/O with this memory.
     """
 
+    # no per-instance __dict__: the per-packet hot paths touch these
+    # attributes every iteration
+    __slots__ = ("__zero", "_memory", "_slot", "_shape_cache")
+
     def __init__(self, slot=3):
         """Init."""
         # zero array
         self.__zero = np.zeros((1, ), np.float32)
 
         self._memory = None
+        self._shape_cache = None
         self._slot = slot
         self.clear()
 
@@ -42,15 +48,9 @@ class VirtualMemory:
 
     def is_shape_equal(self, memory):
         """Test whether the given memory shape fits."""
-        own_shape = self.shape()
-        other_shape = memory.shape()
-
-        if len(own_shape) != len(other_shape):
-            return False
-        for own, other in zip(self.shape(), memory.shape()):
-            if own != other:
-                return False
-        return True
+        # both sides come from the shape cache, so this is one
+        # C-level tuple comparison
+        return self.shape() == memory.shape()
 
     def is_slot_equal(self, memory):
         """Test whether the given memory shape fits."""
@@ -61,15 +61,20 @@ class VirtualMemory:
     def clear(self, slot=None):
         """Clear memory and typecheck."""
 
+        # Each slot gets its own zero array: writes are performed in
+        # place, so slots must never share a buffer.
         if slot is None:
-            self._memory = deque([self.__zero] * self._slot)
+            self._memory = [self.__zero.copy()
+                            for _ in range(self._slot)]
         else:
-            self._memory[slot] = self.__zero
+            self._memory[slot] = self.__zero.copy()
+        self._shape_cache = None
 
     def set(self, slot, shape, dtype):
         """Set shape and dtype"""
         if self._slot >= slot:
             self._memory[slot] = np.zeros(shape, dtype=dtype)
+            self._shape_cache = None
 
     def __getitem__(self, slot):
         """Read."""
@@ -84,13 +89,51 @@ class VirtualMemory:
         return self._memory[slot]
 
     def write(self, slot, data, force=False):
-        """Write."""
-        if not force and not self.__typecheck(data, self._memory[slot]):
-            mem = self._memory[slot]
+        """Write.
+
+        When shape and dtype match, the data is copied into the
+        existing slot buffer in place, so a steady stream of writes
+        allocates nothing. force=True rebinds the slot to the given
+        array without the typecheck.
+        """
+        if force:
+            self._memory[slot] = data
+            self._shape_cache = None
+            return
+
+        mem = self._memory[slot]
+        if not self.__typecheck(data, mem):
             raise TypeError("Virtual memory type check error.\n"
                             f"input: {data.shape}, {data.dtype}\n"
                             f"mem  : {mem.shape}, {mem.dtype}")
-        self._memory[slot] = data
+        np.copyto(mem, data)
+
+    def writeinto(self, slot, buffer):
+        """Write raw bytes into the slot buffer without allocating.
+
+        The buffer must be a bytes-like object whose length equals the
+        slot's nbytes; the bytes are blitted straight into the backing
+        array.
+        """
+        memoryview(self._memory[slot]).cast("B")[:] = buffer
+
+    def write_list_into(self, slot, data_list):
+        """Stack a list of arrays into the slot buffer row by row.
+
+        The slot must already be set to (len(data_list), *row_shape);
+        each array is copied into its row in place, so repeated batch
+        writes allocate no stacked temporary.
+        """
+        out = self._memory[slot]
+        for i, array in enumerate(data_list):
+            np.copyto(out[i], array, casting="no")
+
+    def read_range(self, start, stop):
+        """Return the slot arrays in [start, stop) as a list.
+
+        One C-level list slice instead of a per-slot read loop.
+        """
+        return self._memory[start:stop]
 
     def read_all(self):
         """Read all."""
@@ -101,14 +144,95 @@ class VirtualMemory:
         for i, array in enumerate(memory):
             self.write(i, array, force)
 
+    def write_bulk(self, memory):
+        """Write all slots in place without per-slot typechecks.
+
+        For trusted same-layout sources (such as another head over an
+        identically shaped memory) each slot is one copyto; numpy
+        still raises on a genuine shape mismatch.
+        """
+        for mem, data in zip(self._memory, memory):
+            np.copyto(mem, data)
+
+    def dump_raw(self):
+        """Serialize every slot into one contiguous bytes blob.
+
+        The blob is an 8-byte little-endian slot count followed by a
+        per-slot header (dtype string, ndim, shape, nbytes) and the
+        raw array bytes. Building one buffer lets a peer sync go out
+        as a single sendall instead of one send per slot.
+        """
+        heads = []
+        total = 8
+        for mem in self._memory:
+            dstr = mem.dtype.str.encode("ascii")
+            head = struct.pack(f"<B{len(dstr)}sB{mem.ndim}IQ",
+                               len(dstr), dstr, mem.ndim,
+                               *mem.shape, mem.nbytes)
+            heads.append(head)
+            total += len(head) + mem.nbytes
+
+        buf = bytearray(total)
+        view = memoryview(buf)
+        struct.pack_into("<Q", buf, 0, self._slot)
+        offset = 8
+        for head, mem in zip(heads, self._memory):
+            buf[offset:offset + len(head)] = head
+            offset += len(head)
+            raw = memoryview(np.ascontiguousarray(mem)).cast("B")
+            view[offset:offset + mem.nbytes] = raw
+            offset += mem.nbytes
+        return bytes(buf)
+
+    def load_raw(self, buf):
+        """Load a dump_raw blob back into the slots.
+
+        Slots whose shape and dtype already match are filled in place
+        without allocating; otherwise the slot is rebound to a copy of
+        the zero-copy np.frombuffer view.
+        """
+        count = struct.unpack_from("<Q", buf, 0)[0]
+        offset = 8
+        for slot in range(count):
+            dlen, = struct.unpack_from("<B", buf, offset)
+            offset += 1
+            dstr = bytes(buf[offset:offset + dlen]).decode("ascii")
+            offset += dlen
+            ndim, = struct.unpack_from("<B", buf, offset)
+            offset += 1
+            shape = struct.unpack_from(f"<{ndim}I", buf, offset)
+            offset += 4 * ndim
+            nbytes, = struct.unpack_from("<Q", buf, offset)
+            offset += 8
+
+            mem = self._memory[slot]
+            if mem.shape == shape and mem.dtype.str == dstr:
+                self.writeinto(slot, buf[offset:offset + nbytes])
+            else:
+                array = np.frombuffer(
+                    buf, dtype=dstr,
+                    count=nbytes // np.dtype(dstr).itemsize,
+                    offset=offset).reshape(shape)
+                self._memory[slot] = array.copy()
+                self._shape_cache = None
+            offset += nbytes
+
     def shape(self, slot=None):
-        """Return shape and dtype informations of memory."""
+        """Return shape and dtype informations of memory.
+
+        The full tuple is cached and only rebuilt after an operation
+        that can change a slot's shape or dtype, so repeated shape
+        checks allocate nothing.
+        """
 
         if (slot is not None) and (self._slot >= slot):
             mem = self._memory[slot]
             return (mem.shape, mem.dtype)
 
-        return tuple([(mem.shape, mem.dtype) for mem in self._memory])
+        if self._shape_cache is None:
+            self._shape_cache = tuple((mem.shape, mem.dtype)
+                                      for mem in self._memory)
+        return self._shape_cache
 
     def info(self):
         """Return info string of the memory."""
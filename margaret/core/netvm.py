@@ -6,9 +6,110 @@
 """Network virtual memory module."""
 import threading
 import socket
+import selectors
+import sys
+import os
+import ctypes
+from collections import namedtuple
+
+import numpy as np
 
 from margaret.core.memory import VirtualMemory
-from margaret.core.formats import NumpyRawFormat
+
+# static per-slot wire layout, frozen at set() time
+_Layout = namedtuple("_Layout", ["shape", "dtype", "nbytes",
+                                 "net_dtype", "net_nbytes"])
+
+# recvmmsg(2) support (Linux only). When available, the receive loop
+# drains up to RECV_BATCH queued datagrams per syscall instead of one.
+RECV_BATCH = 16
+
+_LIBC = None
+if sys.platform.startswith("linux"):
+    try:
+        _LIBC = ctypes.CDLL(None, use_errno=True)
+        _LIBC.recvmmsg
+    except (OSError, AttributeError):
+        _LIBC = None
+
+# recvmmsg flag: block for the first datagram only
+_MSG_WAITFORONE = 0x10000
+
+# scatter-gather send support
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+
+
+class _Iovec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p),
+                ("iov_len", ctypes.c_size_t)]
+
+
+class _Msghdr(ctypes.Structure):
+    _fields_ = [("msg_name", ctypes.c_void_p),
+                ("msg_namelen", ctypes.c_uint32),
+                ("msg_iov", ctypes.POINTER(_Iovec)),
+                ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p),
+                ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int)]
+
+
+class _Mmsghdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _Msghdr),
+                ("msg_len", ctypes.c_uint)]
+
+
+class _BatchReceiver:
+    """Batch datagram receiver backed by recvmmsg(2).
+
+    Holds a preallocated ring of receive buffers and mmsghdr entries;
+    recv() blocks for the first datagram and returns every datagram
+    the kernel had queued, amortizing the syscall cost over the batch.
+    """
+
+    _ADDR_LEN = 16    # sizeof(struct sockaddr_in)
+
+    def __init__(self, sock, bufsize, batch=RECV_BATCH):
+        self._sock = sock
+        self._batch = batch
+        self._bufs = [bytearray(bufsize) for _ in range(batch)]
+        self._views = [memoryview(buf) for buf in self._bufs]
+        self._cbufs = [(ctypes.c_char * bufsize).from_buffer(buf)
+                       for buf in self._bufs]
+        self._addrs = [ctypes.create_string_buffer(self._ADDR_LEN)
+                       for _ in range(batch)]
+        self._iovecs = (_Iovec * batch)()
+        self._hdrs = (_Mmsghdr * batch)()
+        for i in range(batch):
+            self._iovecs[i].iov_base = ctypes.cast(self._cbufs[i],
+                                                   ctypes.c_void_p)
+            self._iovecs[i].iov_len = bufsize
+            hdr = self._hdrs[i].msg_hdr
+            hdr.msg_name = ctypes.cast(self._addrs[i], ctypes.c_void_p)
+            hdr.msg_namelen = self._ADDR_LEN
+            hdr.msg_iov = ctypes.pointer(self._iovecs[i])
+            hdr.msg_iovlen = 1
+
+    @staticmethod
+    def _parse_addr(raw):
+        port = int.from_bytes(raw[2:4], "big")
+        return (socket.inet_ntoa(raw[4:8]), port)
+
+    def recv(self):
+        """Return a list of (view, nbytes, addr) received datagrams."""
+        nret = _LIBC.recvmmsg(self._sock.fileno(), self._hdrs,
+                              self._batch, _MSG_WAITFORONE, None)
+        if nret < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        out = []
+        for i in range(nret):
+            addr = self._parse_addr(self._addrs[i].raw)
+            out.append((self._views[i], self._hdrs[i].msg_len, addr))
+            self._hdrs[i].msg_hdr.msg_namelen = self._ADDR_LEN
+        return out
+
 
 class NetVM(VirtualMemory):
     """NetVM.
@@ -17,13 +118,60 @@ class NetVM(VirtualMemory):
     function. Memory data can be sent and received via UDP/IP.
     """
 
+    __slots__ = ("host", "port", "_callbacks", "_tx", "_tx_port",
+                 "_layout")
+
     def __init__(self, slot, host="", port=5000):
         """Init."""
         super(NetVM, self).__init__(slot)
 
         self.host = host
         self.port = port
-        self._callbacks = [lambda array, addr, slot: True] * slot
+        # None means no callback; the receive loops skip the call
+        # entirely instead of invoking a no-op lambda per packet
+        self._callbacks = [None] * slot
+        self._tx = None
+        self._tx_port = None
+        self._layout = [None] * slot
+
+    def set(self, slot, shape, dtype, net_dtype=None):
+        """Set shape and dtype and freeze the slot's wire layout.
+
+        The layout (shape, dtype, nbytes) never changes after set, so
+        the receive paths read it by integer index instead of
+        reconstructing shape tuples per packet.
+
+        net_dtype selects a narrower on-wire dtype for the slot (for
+        example float16 to halve the datagram size). It is opt-in
+        because the down-cast is lossy: sends quantize to net_dtype
+        and receives promote back to the slot dtype.
+        """
+        super(NetVM, self).set(slot, shape, dtype)
+        mem = self.read(slot)
+        if net_dtype is not None:
+            net_dtype = np.dtype(net_dtype)
+            net_nbytes = mem.size * net_dtype.itemsize
+        else:
+            net_nbytes = mem.nbytes
+        self._layout[slot] = _Layout(mem.shape, mem.dtype, mem.nbytes,
+                                     net_dtype, net_nbytes)
+
+    def _expected(self, slot):
+        layout = self._layout[slot]
+        if layout is not None:
+            return layout.net_nbytes
+        return self.read(slot).nbytes
+
+    def _ingest_into(self, array, slot, payload):
+        layout = self._layout[slot]
+        if layout is not None and layout.net_dtype is not None:
+            wire = np.frombuffer(payload, dtype=layout.net_dtype)
+            np.copyto(array, wire.reshape(layout.shape), casting="unsafe")
+        else:
+            memoryview(array).cast("B")[:] = payload
+
+    def _ingest(self, slot, payload):
+        self._ingest_into(self._memory[slot], slot, payload)
 
     def resv(self, slot):
         """Receive
@@ -32,39 +180,161 @@ class NetVM(VirtualMemory):
         the number of bytes does not match. If the number of bytes
         matches, the reception is successful and the memory is rewritten.
         Executes the function specified in the callback.
+
+        The datagram is received with recvfrom_into into a reused
+        scratch buffer and blitted into the slot array, so the hot
+        loop performs no per-packet allocation.
         """
+        expected = self._expected(slot)
+
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as soc:
             soc.bind((self.host, self.port + slot))
 
+            if _LIBC is not None:
+                # drain every queued datagram per syscall
+                receiver = _BatchReceiver(soc, expected + 1)
+                while True:
+                    for view, nbytes, addr in receiver.recv():
+                        if nbytes != expected:
+                            continue
+                        self._ingest(slot, view[:expected])
+                        callback = self._callbacks[slot]
+                        if callback is not None:
+                            callback(self.read(slot), addr, slot)
+                return
+
+            # fallback: one datagram per syscall
+            scratch = bytearray(expected + 1)
+            view = memoryview(scratch)
             while True:
-                data, addr = soc.recvfrom(self.read(slot).nbytes + 1)
-                if len(data) != self.read(slot).nbytes:
+                nbytes, addr = soc.recvfrom_into(scratch)
+                if nbytes != expected:
                     continue
 
-                shape, dtype = self.shape(slot)
-                array = NumpyRawFormat.decode(data, shape, dtype)
-                self.write(slot, array)
-                self._callbacks[slot](array, addr, slot)
+                self._ingest(slot, view[:expected])
+                callback = self._callbacks[slot]
+                if callback is not None:
+                    callback(self.read(slot), addr, slot)
+
+    def _tx_sock(self, src_port):
+        """Return the cached send socket bound to src_port.
+
+        The socket is created and bound once and reused by every send,
+        so the per-frame cost is the sendto alone. A src_port change
+        rebinds by replacing the socket.
+        """
+        if self._tx is None or self._tx_port != src_port:
+            if self._tx is not None:
+                self._tx.close()
+            soc = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            if hasattr(socket, "IP_MTU_DISCOVER"):
+                # fail oversized frames locally instead of fragmenting
+                soc.setsockopt(socket.IPPROTO_IP, socket.IP_MTU_DISCOVER,
+                               socket.IP_PMTUDISC_DO)
+            soc.bind((self.host, src_port))
+            self._tx = soc
+            self._tx_port = src_port
+        return self._tx
 
     def send(self, slot, host, port, src_port=3000):
         """Send
         Sends memory data for the specified slot via a UDP socket.
+        The socket is bound once and cached, and the payload is a
+        zero-copy view of the slot array. Slots set with a net_dtype
+        are quantized to it before going on the wire.
         """
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as soc:
-            soc.bind((self.host, src_port))
-            mem = self.read(slot)
-            soc.sendto(mem, (host, port))
+        mem = self.read(slot)
+        layout = self._layout[slot]
+        if layout is not None and layout.net_dtype is not None:
+            mem = np.ascontiguousarray(mem.astype(layout.net_dtype,
+                                                  copy=False))
+        view = memoryview(mem).cast("B")
+        soc = self._tx_sock(src_port)
+        if _HAS_SENDMSG:
+            # one zero-copy syscall; the kernel gathers the iovec
+            # straight from the array buffer
+            soc.sendmsg((view, ), (), 0, (host, port))
+        else:
+            soc.sendto(view, (host, port))
+
+    def _listen_loop(self, sel):
+        while True:
+            for key, _ in sel.select():
+                slot, expected, scratch, view = key.data
+                soc = key.fileobj
+                # drain the ready socket before moving on
+                while True:
+                    try:
+                        nbytes, addr = soc.recvfrom_into(scratch)
+                    except BlockingIOError:
+                        break
+                    if nbytes != expected:
+                        continue
+                    self._ingest(slot, view[:expected])
+                    callback = self._callbacks[slot]
+                    if callback is not None:
+                        callback(self.read(slot), addr, slot)
+
+    def _listen_loop_swap(self, sel):
+        while True:
+            for key, _ in sel.select():
+                slot, expected, scratch, view, bufs, flip = key.data
+                soc = key.fileobj
+                while True:
+                    try:
+                        nbytes, addr = soc.recvfrom_into(scratch)
+                    except BlockingIOError:
+                        break
+                    if nbytes != expected:
+                        continue
+                    array = bufs[flip[0]]
+                    self._ingest_into(array, slot, view[:expected])
+                    # a list store is atomic under the GIL, so the
+                    # filled buffer is published without a lock
+                    self._memory[slot] = array
+                    flip[0] ^= 1
+                    callback = self._callbacks[slot]
+                    if callback is not None:
+                        callback(array, addr, slot)
 
-    def listen(self):
+    def listen(self, workers=1):
         """Listen
-        Start a thread for receiving. The port number will be the
-        specified port number + slot number.
+        Start receiving on all slots. The port number is the specified
+        port number + slot number.
+
+        With workers=1 all slot sockets are served by one selector
+        event loop on a single background thread. workers > 1 starts
+        that many loops, each with its own SO_REUSEPORT-bound sockets
+        and double buffers, so the kernel hashes arriving packets
+        across them; each worker publishes a filled buffer into the
+        slot with an atomic list store. Falls back to a single worker
+        where SO_REUSEPORT is unavailable.
         """
-        threads = []
-        for i in range(self._slot):
-            th = threading.Thread(target=self.resv, args=(i, ), daemon=True)
-            threads.append(th)
-            th.start()
+        if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+            workers = 1
+
+        for _ in range(workers):
+            sel = selectors.DefaultSelector()
+            for i in range(self._slot):
+                soc = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                if workers > 1:
+                    soc.setsockopt(socket.SOL_SOCKET,
+                                   socket.SO_REUSEPORT, 1)
+                soc.bind((self.host, self.port + i))
+                soc.setblocking(False)
+                expected = self._expected(i)
+                scratch = bytearray(expected + 1)
+                if workers == 1:
+                    data = (i, expected, scratch, memoryview(scratch))
+                else:
+                    mem = self.read(i)
+                    data = (i, expected, scratch, memoryview(scratch),
+                            [np.empty_like(mem), np.empty_like(mem)], [0])
+                sel.register(soc, selectors.EVENT_READ, data=data)
+            target = (self._listen_loop if workers == 1
+                      else self._listen_loop_swap)
+            threading.Thread(target=target, args=(sel, ),
+                             daemon=True).start()
 
     def on(self, slot, callback):
         """Set a callback event for the slot."""
@@ -73,7 +343,7 @@ class NetVM(VirtualMemory):
 
     def off(self, slot):
         """Unsets the slot callback event."""
-        self._callbacks[slot] = lambda array, addr, slot: True
+        self._callbacks[slot] = None
 
     def info(self):
         """Return info string of the memory."""
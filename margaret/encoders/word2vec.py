@@ -5,13 +5,22 @@
 
 """Word2vec encoder modules."""
 
+import functools
 import logging
-from threading import Lock
+from threading import Lock, local
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import MeCab
 from gensim.models import Word2Vec
 from gensim.models import KeyedVectors
 
+try:
+    import faiss
+except ImportError:
+    # faiss is an optional accelerator for the batched decode path;
+    # without it the normalized-matrix fallback below is used.
+    faiss = None
+
 # LOGGER
 LOGGER = logging.getLogger(__name__)
 
@@ -21,7 +30,11 @@ class Word2vecEncoderBase:
     def __init__(self, model_file, keyed_format, mecab_option):
         """Init."""
         LOGGER.info("Loading mecab")
-        self.mecab = MeCab.Tagger(" {}".format(mecab_option))
+        # MeCab taggers are not thread safe, so each thread gets its
+        # own; self.mecab stays bound to the construction thread's.
+        self._mecab_option = mecab_option
+        self._tls = local()
+        self.mecab = self._tagger()
         LOGGER.info("Loading word2vector or fasttext model.")
         if keyed_format:
             self.model = KeyedVectors\
@@ -31,22 +44,111 @@ class Word2vecEncoderBase:
             self.model = Word2Vec.load(model_file)
         LOGGER.info("vocab : %d words.", len(self.model.wv.vocab))
 
+        self._wakati_cached = functools.lru_cache(maxsize=20000)(
+            self._wakati_impl)
+
+    def _tagger(self):
+        tagger = getattr(self._tls, "tagger", None)
+        if tagger is None:
+            tagger = MeCab.Tagger(" {}".format(self._mecab_option))
+            self._tls.tagger = tagger
+        return tagger
+
+    def _wakati_impl(self, text):
+        return tuple(self._tagger().parse(text).split(" ")[0:-1])
+
     def wakati(self, text):
-        """Return wakati list."""
-        return self.mecab.parse(text).split(" ")[0:-1]
+        """Return wakati tuple.
+
+        Parses are memoized per text, so repeated strings skip MeCab
+        entirely. The result is a tuple because cache hits share it.
+        """
+        return self._wakati_cached(text)
 
     def unload_model(self):
         """Unload gensim model."""
         self.model = None
+        self._wakati_cached.cache_clear()
+        cache = getattr(self, "_encode_cached", None)
+        if cache is not None:
+            cache.cache_clear()
 
 class Word2vecEncoder(Word2vecEncoderBase):
     """Text to Wordvector module."""
 
-    def __init__(self, model_file, keyed_format=True, mecab_option="-Owakati"):
-        """Init."""
+    def __init__(self, model_file, keyed_format=True, mecab_option="-Owakati",
+                 quantize=False):
+        """Init.
+
+        quantize=True builds the decode index as a product-quantized
+        faiss IndexIVFPQ instead of the exact flat index, cutting the
+        index memory roughly 8-32x and making the search
+        sublinear in the vocabulary. The search becomes approximate,
+        so it is opt-in; without faiss the flag is ignored.
+        """
         super(Word2vecEncoder, self).__init__(model_file, keyed_format,
                                               mecab_option)
 
+        # nearest-neighbour index, built lazily on first decode
+        self._quantize = quantize
+        self._i2w = None
+        self._faiss = None
+        self._normed = None
+
+        # contiguous view of the embedding matrix and its own
+        # word->row dict for the vectorize gather
+        self._vectors = np.ascontiguousarray(
+            self.model.wv.vectors, dtype=np.float32)
+        self._w2i = {w: i for i, w in
+                     enumerate(self.model.wv.index2word)}
+
+        # per-instance LRU over the tokenize + vectorize pipeline;
+        # repeated texts skip MeCab and the vocab lookups entirely
+        self._encode_cached = functools.lru_cache(maxsize=10000)(
+            self._encode_impl)
+
+    def _build_index(self):
+        vecs = np.asarray(self.model.wv.vectors, dtype=np.float32)
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        np.maximum(norms, 1e-12, out=norms)
+        normed = np.ascontiguousarray(vecs / norms)
+        self._i2w = self.model.wv.index2word
+        if faiss is None:
+            if self._quantize:
+                LOGGER.warning("faiss is not installed; "
+                               "quantize is ignored.")
+            self._normed = normed
+            return
+
+        dim = normed.shape[1]
+        if self._quantize:
+            nlist = max(1, int(4 * np.sqrt(normed.shape[0])))
+            # subquantizer count must divide the dimension
+            sub = next(m for m in range(max(1, dim // 4), 0, -1)
+                       if dim % m == 0)
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, sub, 8)
+            index.train(normed)
+            index.add(normed)
+            index.nprobe = 8
+            self._faiss = index
+        else:
+            self._faiss = faiss.IndexFlatIP(dim)
+            self._faiss.add(normed)
+
+    def _nearest(self, queries):
+        """Return the vocab index of the nearest word per query row."""
+        if self._i2w is None:
+            self._build_index()
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        np.maximum(norms, 1e-12, out=norms)
+        queries = queries / norms
+        if self._faiss is not None:
+            _, indices = self._faiss.search(
+                np.ascontiguousarray(queries), 1)
+            return indices[:, 0]
+        return np.argmax(self._normed @ queries.T, axis=0)
+
     def similar_word_by_vector(self, vector, topn=10):
         """Return similar word."""
         return self.model.similar_by_vector(vector=vector,
@@ -63,17 +165,20 @@ class Word2vecEncoder(Word2vecEncoderBase):
             return None
 
     def vectorize(self, wakati_list):
-        """Return vector list created from word list."""
-        vectorized = []
-        try:
-            vectorized = self.model[wakati_list]
-        except KeyError:
+        """Return vector list created from word list.
+
+        One C-level gather over the contiguous embedding matrix
+        replaces gensim's per-key __getitem__ loop.
+        """
+        get = self._w2i.get
+        idx = np.fromiter((get(word, -1) for word in wakati_list),
+                          dtype=np.int64, count=len(wakati_list))
+        if (idx < 0).any():
             LOGGER.warning("Vectorize vocab error: %s", wakati_list)
             return None
-        return vectorized
+        return self._vectors.take(idx, axis=0)
 
-    def encode(self, text, fix_length=False, maxlen=10, blankchar="空白"):
-        """Encode text to vector."""
+    def _encode_impl(self, text, fix_length, maxlen, blankchar):
         wakati_list = self.wakati(text)
 
         if wakati_list is False or len(wakati_list) > maxlen:
@@ -81,21 +186,81 @@ class Word2vecEncoder(Word2vecEncoderBase):
 
         if fix_length:
             if len(wakati_list) != maxlen:
-                wakati_list += [blankchar]*(maxlen-len(wakati_list))
-
-        return self.vectorize(wakati_list)
+                wakati_list += (blankchar, )*(maxlen-len(wakati_list))
 
-    def decode(self, vector_list, sepalator="", blankchar="空白"):
-        """Decode vector to text."""
-        vector_array = np.array(vector_list, dtype=np.float32)
-        answer_texts = []
+        vectorized = self.vectorize(wakati_list)
+        if vectorized is not None:
+            # the cached array is shared between hits
+            vectorized.setflags(write=False)
+        return vectorized
 
-        for vec in vector_array:
-            similar_word = self.similar_word_by_vector(vec)[0][0]
-            if similar_word != blankchar and similar_word is not None:
-                answer_texts.append(similar_word)
+    def encode(self, text, fix_length=False, maxlen=10, blankchar="空白"):
+        """Encode text to vector.
+
+        Results are memoized per (text, fix_length, maxlen,
+        blankchar), so repeated phrases skip the MeCab parse and the
+        embedding lookups. The returned array is read-only because
+        cache hits share it; copy before mutating.
+        """
+        return self._encode_cached(text, fix_length, maxlen, blankchar)
+
+    def encode_batch(self, texts, max_workers=None, **kwargs):
+        """Encode a list of texts concurrently.
+
+        MeCab parsing happens outside the GIL and each worker thread
+        uses its own tagger, so a batch of distinct texts tokenizes
+        in parallel. Returns one result per text, in order.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(
+                lambda text: self.encode(text, **kwargs), texts))
 
-        return sepalator.join(answer_texts)
+    def decode(self, vector_list, sepalator="", blankchar="空白"):
+        """Decode vector to text.
+
+        All vectors are resolved in one batched cosine
+        nearest-neighbour search over the L2-normalized vocabulary
+        matrix (one matmul, or one faiss search when faiss is
+        installed) instead of a per-vector similar_by_vector call.
+        """
+        vector_array = np.asarray(vector_list, dtype=np.float32)
+        if vector_array.ndim == 1:
+            vector_array = vector_array[np.newaxis, :]
+
+        indices = self._nearest(vector_array)
+        i2w = self._i2w
+        return sepalator.join(word for word in (i2w[i] for i in indices)
+                              if word != blankchar and word is not None)
+
+    def decode_batch(self, batches, sepalator="", blankchar="空白"):
+        """Decode several vector lists to texts in one search.
+
+        All vectors are stacked into a single (N, d) query matrix and
+        resolved by one nearest-neighbour search, then the words are
+        re-split per input list, so the per-call Python and search
+        overhead is amortized across the whole batch. Returns one
+        text per input list, in order.
+        """
+        shapes = [len(vector_list) for vector_list in batches]
+        if sum(shapes) == 0:
+            return [""] * len(shapes)
+
+        matrix = np.concatenate(
+            [np.asarray(vector_list, dtype=np.float32)
+             .reshape(len(vector_list), -1)
+             for vector_list in batches if len(vector_list)])
+        indices = self._nearest(matrix)
+        i2w = self._i2w
+        words = [i2w[i] for i in indices]
+
+        out = []
+        start = 0
+        for length in shapes:
+            out.append(sepalator.join(
+                word for word in words[start:start + length]
+                if word != blankchar and word is not None))
+            start += length
+        return out
 
 class Word2vecLink(Word2vecEncoderBase):
     """Text to Wordvector embeded layer."""
@@ -110,6 +275,9 @@ class Word2vecLink(Word2vecEncoderBase):
         self.word2index = {w: i for i, w in enumerate(self.index2word)}
         self.n_vocab = len(self.index2word)
 
+        self._encode_cached = functools.lru_cache(maxsize=10000)(
+            self._encode_impl)
+
         # memory clear
         if memory_clear:
             self.unload_model()
@@ -134,59 +302,65 @@ class Word2vecLink(Word2vecEncoderBase):
 
         return self.index2word[index]
 
-    def encode(self, text, fix_length=False, minlen=1, maxlen=10):
-        """Encode."""
+    def _encode_impl(self, text, fix_length, minlen, maxlen):
         wakati_list = self.wakati(text)
-        if len(wakati_list) > maxlen:
-            return None
-        if len(wakati_list) < minlen:
+        length = len(wakati_list)
+        if length > maxlen or length < minlen:
             return None
 
-        vector_list = []
-        for word in wakati_list:
-            index = self.get_index_from_word(word)
+        rows = maxlen if fix_length else length
+        out = np.full((rows, 1), self.n_vocab - 1, dtype=np.int32)
+        get = self.word2index.get
+        for i, word in enumerate(wakati_list):
+            index = get(word)
             if index is None:
                 return None
-            vector_list.append([index])
+            out[i, 0] = index
 
-        black_index = self.n_vocab - 1
-        if fix_length and len(vector_list) != maxlen:
-            vector_list += [[black_index]]*(maxlen-len(wakati_list))
+        out.setflags(write=False)
+        return out
+
+    def encode(self, text, fix_length=False, minlen=1, maxlen=10):
+        """Encode.
 
-        return vector_list
+        Token indices go straight into a preallocated (rows, 1) int32
+        array prefilled with the blank index, so padding costs nothing
+        and no per-token lists are built. Results are memoized per
+        (text, fix_length, minlen, maxlen); the returned array is
+        read-only because cache hits share it.
+        """
+        return self._encode_cached(text, fix_length, minlen, maxlen)
 
     def decode(self, vector_list, sepalator=""):
-        """Decode."""
-        length = len(vector_list)
-        black_index = self.n_vocab-1
-        word_list = [None] * len(vector_list)
-        for i in range(length):
-            index = vector_list[i][0]
-            if int(index) == black_index:
-                word_list[i] = ""
-                continue
-            word_list[i] = self.get_word_from_index(index)
+        """Decode.
+
+        Accepts the nested-list form as well as the (n, 1) int32
+        array that encode returns; the indices are flattened once and
+        resolved with locally bound lookups.
+        """
+        indices = np.asarray(vector_list, dtype=np.int64).reshape(-1)
+        black_index = self.n_vocab - 1
+        get_word = self.get_word_from_index
+        word_list = [""] * len(indices)
+        for i, index in enumerate(indices):
+            if index != black_index:
+                word_list[i] = get_word(index)
 
         return sepalator.join(word_list)
 
 
 
 class LockedWord2vecEncoder(Word2vecEncoder):
-    """Locked encoder."""
+    """Locked encoder.
+
+    Kept for compatibility. The encoder state is read-only after
+    construction and each thread parses with its own MeCab tagger, so
+    encode/decode no longer take the coarse lock that used to
+    serialize every call; concurrent requests run in parallel. The
+    lock attribute remains for callers that guard their own sections.
+    """
 
     def __init__(self, *args, **kwargs):
         """Init."""
         super(LockedWord2vecEncoder, self).__init__(*args, **kwargs)
         self.lock = Lock()
-
-    def encode(self, *args, **kwargs):
-        """Locked encode."""
-        with self.lock:
-            ret = super(LockedWord2vecEncoder, self).encode(*args, **kwargs)
-        return ret
-
-    def decode(self, *args, **kwargs):
-        """Locked decode."""
-        with self.lock:
-            ret = super(LockedWord2vecEncoder, self).decode(*args, **kwargs)
-        return ret
@@ -4,6 +4,9 @@
 # Licensed under the MIT License
 
 """Loader module."""
+import warnings
+
+import numpy as np
 import onnx
 
 class OnnxLoader:
@@ -12,19 +15,84 @@ class OnnxLoader:
     onnx_loader reads a file written in onnx format and prepares it
     for execution. Loader basically provides only __run __() as
     the only method.
+
+    The default backend is onnxruntime with full graph optimization,
+    which fuses ops and runs on its native kernels (and on CUDA when
+    the provider is available) with far less per-call dispatch than
+    the caffe2 shim. The caffe2 backend is kept for compatibility but
+    deprecated.
     """
 
-    def __init__(self, onnx_model_pb_path, backend="caffe2"):
-        """Init."""
-        if backend == "caffe2":
+    def __init__(self, onnx_model_pb_path, backend="onnxruntime",
+                 iobinding=False):
+        """Init.
+
+        iobinding=True keeps the input tensors in reusable OrtValues
+        and binds them once, so repeated same-shape calls update the
+        buffers in place instead of re-allocating and re-copying per
+        run; the binding is rebuilt automatically when input shapes
+        change. Only meaningful with the onnxruntime backend.
+        """
+        self._session = None
+        self._input_names = None
+        self._iobinding = iobinding and backend == "onnxruntime"
+        self._io = None
+        self._in_vals = None
+        self._in_shapes = None
+
+        if backend == "onnxruntime":
+            import onnxruntime as ort
+            options = ort.SessionOptions()
+            options.graph_optimization_level = \
+                ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            providers = ["CPUExecutionProvider"]
+            if "CUDAExecutionProvider" in ort.get_available_providers():
+                providers.insert(0, "CUDAExecutionProvider")
+            self._session = ort.InferenceSession(onnx_model_pb_path,
+                                                 sess_options=options,
+                                                 providers=providers)
+            self._input_names = [item.name
+                                 for item in self._session.get_inputs()]
+            self.model = self._session
+        elif backend == "caffe2":
+            warnings.warn("The caffe2 backend is deprecated; "
+                          "use backend='onnxruntime'.",
+                          DeprecationWarning)
             from caffe2.python.onnx.backend import prepare
+            onnx_model = onnx.load(onnx_model_pb_path)
+            self.model = prepare(onnx_model)
         else:
             raise RuntimeError("Backend {} is a non-configurable value."
                                .format(backend))
 
-        onnx_model = onnx.load(onnx_model_pb_path)
-        self.model = prepare(onnx_model)
+    def _bind(self, inputs):
+        import onnxruntime as ort
+        self._io = self._session.io_binding()
+        self._in_vals = []
+        self._in_shapes = tuple(array.shape for array in inputs)
+        for name, array in zip(self._input_names, inputs):
+            value = ort.OrtValue.ortvalue_from_numpy(array)
+            self._in_vals.append(value)
+            self._io.bind_ortvalue_input(name, value)
+        for out in self._session.get_outputs():
+            self._io.bind_output(out.name)
 
     def __call__(self, inputs):
         """Call."""
-        return self.model.run(inputs)
+        if self._session is None:
+            return self.model.run(inputs)
+
+        if not self._iobinding:
+            return self._session.run(None,
+                                     dict(zip(self._input_names, inputs)))
+
+        inputs = [np.ascontiguousarray(array) for array in inputs]
+        if (self._io is None
+                or tuple(array.shape for array in inputs)
+                != self._in_shapes):
+            self._bind(inputs)
+        else:
+            for value, array in zip(self._in_vals, inputs):
+                value.update_inplace(array)
+        self._session.run_with_iobinding(self._io)
+        return self._io.copy_outputs_to_cpu()
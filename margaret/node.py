@@ -75,9 +75,9 @@ class Node:
         return self._chains
 
     def _event(self, name, data):
-        # exec chain
+        # exec chain; the methods were resolved at registration
         for method in self._chains[name][0]:
-            data = getattr(self, method)(data)
+            data = method(data)
 
         work = self._chains[name][1]
 
@@ -99,11 +99,11 @@ class Node:
         if self._chains[chain][2] is None:
             return True
 
-        responce = self._chains[chain][2][-1]
+        responce = self._chains[chain][3]
 
-        # exec chain
+        # exec chain; the methods were resolved at registration
         for method in self._chains[chain][2]:
-            data = getattr(self, method)(data)
+            data = method(data)
 
         if data is None:
             return False
@@ -134,7 +134,15 @@ class Node:
                 if not callable(getattr(self, responce, None)):
                     TypeError("responce name is not callable")
 
-        self._chains[events[0]] = [events, work, responces]
+        # resolve the method names to bound methods once, so the
+        # per-message chains walk tuples of callables with no getattr
+        self._chains[events[0]] = [
+            tuple(getattr(self, event) for event in events),
+            work,
+            (tuple(getattr(self, responce) for responce in responces)
+             if responces is not None else None),
+            responces[-1] if responces else None,
+        ]
 
         return True
 
@@ -4,11 +4,16 @@
 
 """Sequence"""
 import logging
+from collections import namedtuple
+import numpy as np
 from margaret.core.memory import VirtualMemory
 from margaret.core.cell import Cell
 
 LOGGER = logging.getLogger(__name__)
 
+# Sequence step format; dict-style consumers can use _asdict()
+SeqItem = namedtuple("SeqItem", ["work", "before", "after", "mem"])
+
 
 class SequenceHead:
     """SequenceHead.
@@ -60,12 +65,104 @@ class SequenceHead:
             if x is not None:
                 self._mem[n + i] = x
 
+    def set_bulk(self, slot_index, arrays):
+        """Write one slot across every timestep in a single sweep.
+
+        arrays is a (seqlen, *feature) array (or a sequence of
+        per-timestep arrays); row n lands where set(n, ...) would put
+        the slot_index-th argument, but without the per-timestep
+        argument packing and slot-count checks.
+        """
+        mem = self._mem
+        for n, array in enumerate(arrays):
+            mem[n + slot_index] = array
+
     def get(self, n):
         """Return the nth sequence memory data.
 
-        The return value is a list of slot lengths.
+        The return value is a list of slot lengths, taken as one list
+        slice of the backing memory instead of a per-slot read loop.
         """
-        return [self._mem[n + i] for i in range(self._slot)]
+        return self._mem.read_range(n, n + self._slot)
+
+    def replace(self, mem):
+        """replace.
+
+        Replace referenced memory with external memory.
+        """
+        if self._mem.is_shape_equal(mem):
+            self._mem = mem
+
+
+class BlockSequenceHead:
+    """BlockSequenceHead.
+
+    Structure-of-arrays variant of SequenceHead: each slot's timeline
+    is one contiguous (seqlen, *feature) array held in a slot of a
+    VirtualMemory with one entry per sequence slot. Whole-sequence
+    operations on a slot then read stride-1 memory, and bulk loads
+    are single slab assignments instead of per-timestep writes. The
+    set/get/set_bulk/replace API matches SequenceHead.
+    """
+
+    def __init__(self, mem, seqlen, slot=2):
+        """Init."""
+        self._seqlen = seqlen
+        self._slot = slot
+
+        if not self._type_check(mem):
+            raise TypeError("The specified memory cannot be set.")
+        self._mem = mem
+
+    @staticmethod
+    def alloc(seqlen, slot, feature, dtype="float32"):
+        """Alloc.
+
+        Get the initial memory: one contiguous (seqlen, *feature)
+        array per slot.
+        """
+        if isinstance(feature, int):
+            feature = (feature, )
+        mem = VirtualMemory(slot)
+        for i in range(slot):
+            mem.set(i, (seqlen, ) + tuple(feature), dtype)
+        return mem
+
+    def _type_check(self, mem):
+        if not isinstance(mem, VirtualMemory):
+            return False
+
+        shape = mem.shape()
+        if len(shape) != self._slot:
+            return False
+        return all(item[0][0] == self._seqlen for item in shape)
+
+    def set(self, n, *xargs):
+        """Set the nth sequence memory data.
+
+        Raises the exception ValueError if the number of slots does not match.
+        """
+        if len(xargs) != self._slot:
+            raise ValueError("The number of input slots does not match.")
+
+        for i, x in enumerate(xargs):
+            if x is not None:
+                self._mem.read(i)[n] = x
+
+    def set_bulk(self, slot_index, arrays):
+        """Write one slot across every timestep as a single slab."""
+        self._mem.read(slot_index)[:len(arrays)] = arrays
+
+    def get(self, n):
+        """Return the nth sequence memory data.
+
+        The return value is a list of per-slot timestep views.
+        """
+        return [self._mem.read(i)[n] for i in range(self._slot)]
+
+    def block(self, slot_index):
+        """Return the contiguous (seqlen, *feature) timeline array."""
+        return self._mem.read(slot_index)
 
     def replace(self, mem):
         """replace.
@@ -96,14 +193,25 @@ class Sequence:
         self.data.set(n, *xargs)
         self.operands[n] = (work, before, after)
 
+    def set_bulk(self, slot_index, arrays):
+        """Write one data slot across all timesteps in one sweep.
+
+        Operands are untouched; set them separately when needed.
+        """
+        self.data.set_bulk(slot_index, arrays)
+
     def get(self, n):
-        """Return the nth sequence."""
-        return {
-            "work": self.operands[0],
-            "before": self.operands[1],
-            "after": self.operands[2],
-            "mem": self.data.get(n)
-        }
+        """Return the nth sequence as a SeqItem.
+
+        The namedtuple is filled with pointer writes, so iter_get no
+        longer allocates a fresh four-key dict per step. This also
+        fixes get() reading the first operand regardless of n.
+        """
+        operand = self.operands[n]
+        if operand is None:
+            operand = (None, None, None)
+        return SeqItem(operand[0], operand[1], operand[2],
+                       self.data.get(n))
 
     def iter_get(self, order):
         """Interation get method."""
@@ -115,6 +223,48 @@ class Sequence:
                 yield self.get(i)
 
 
+class Sequencer:
+    """Sequencer.
+
+    Conversion helpers between sequences and plain nested lists.
+    """
+
+    @staticmethod
+    def sequence2list(sequence):
+        """Convert a sequence to one nested list per slot.
+
+        The per-slot output arrays are preallocated as
+        (seqlen, *feature) from the first timestep's shapes and filled
+        slice by slice in a single pass over the sequence, so nothing
+        is concatenated per timestep and no list object is shared
+        between slots. The final tolist happens once per slot.
+        """
+        first = sequence.data.get(0)
+        slots = [np.empty((sequence.seqlen, ) + np.shape(arr),
+                          dtype=np.float32)
+                 for arr in first]
+        for n in range(sequence.seqlen):
+            mem = sequence.data.get(n)
+            for i, out in enumerate(slots):
+                out[n] = mem[i]
+        return [out.tolist() for out in slots]
+
+    @staticmethod
+    def list2sequence(sequence, slot_lists):
+        """Fill a sequence from one nested list per slot.
+
+        Each slot's list is converted to a single (seqlen, *feature)
+        float32 array and written as one slab via set_bulk, instead of
+        one Sequence.set call (with its argument packing and checks)
+        per timestep. A None entry leaves that slot untouched.
+        """
+        for i, slot_list in enumerate(slot_lists):
+            if slot_list is None:
+                continue
+            sequence.set_bulk(i, np.asarray(slot_list,
+                                            dtype=np.float32))
+
+
 class SequenceCell(Cell):
     """SequenceCell.
 
@@ -141,7 +291,8 @@ class SequenceCell(Cell):
         ition, False is returned.
         """
         if pos < self._seqlen:
-            self.drain.write_all(self._head.get(pos))
+            # trusted same-layout copy: skip the per-slot typecheck
+            self.drain.write_bulk(self._head.get(pos))
             self.pos = pos
             return True
 
@@ -153,4 +304,4 @@ class SequenceCell(Cell):
             self._gate.wait()
             self.seek(self.pos)
             self._gate.clear()
-            self._internal_release()
+            self._done.set()
@@ -12,19 +12,158 @@ abstract socket-IO.
 import time
 import threading
 import logging
-import os
-import socketio
-from flask import Flask
+import importlib
+import inspect
+import sys
+import socket
+import itertools
+from collections import deque
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:
+    # msgpack is an optional payload codec; without it (or with a
+    # python-socketio that predates the serializer argument) the
+    # default JSON packet encoding is used.
+    msgpack = None
+
+# socketio and flask are imported on first Master/Worker construction
+# rather than at module load: a worker-only process never touches
+# Flask (and its Werkzeug/Jinja2 tail), which matters on small hosts.
+socketio = None
+Flask = None
 
 LOGGER = logging.getLogger(__name__)
 
+# per-process guard so non-debug buses silence the socketio loggers
+# at most once instead of re-walking the logger dict per instance
+_SILENCED = {"master": False, "worker": False}
+
+
+def _set_nodelay(sock):
+    """Disable Nagle on a transport socket, best effort.
+
+    The bus traffic is many small latency-sensitive frames, for which
+    Nagle only adds delay. Transport internals differ per server and
+    per socketio version, so failures are silently ignored.
+    """
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (OSError, AttributeError):
+        pass
+
+
+def _transport_socket(eio):
+    """Return the raw socket of an engineio transport, best effort."""
+    websocket = getattr(eio, "ws", None)
+    if websocket is not None:
+        return getattr(websocket, "sock", None)
+    return None
+
+
+# msgpack ext type carrying a raw ndarray (dtype, shape, bytes);
+# float payloads go over the wire as binary instead of JSON digits
+_NDARRAY_EXT = 1
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, np.ndarray):
+        payload = msgpack.packb(
+            (obj.dtype.str, obj.shape,
+             np.ascontiguousarray(obj).tobytes()),
+            use_bin_type=True)
+        return msgpack.ExtType(_NDARRAY_EXT, payload)
+    raise TypeError("Cannot serialize {!r}".format(type(obj)))
+
+
+def _msgpack_ext_hook(code, data):
+    if code == _NDARRAY_EXT:
+        dstr, shape, raw = msgpack.unpackb(data, raw=False)
+        return np.frombuffer(raw, dtype=dstr).reshape(shape)
+    return msgpack.ExtType(code, data)
+
+
+def _supports_serializer(cls):
+    try:
+        return "serializer" in inspect.signature(cls.__init__).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _build_serializer_kwargs(sio_module):
+    """Return serializer kwargs for Server/Client construction.
+
+    The serializer argument appeared in python-socketio 4.4; on older
+    installs (or without msgpack) the kwargs stay empty and the
+    default JSON framing is used. Both bus endpoints derive the codec
+    from the same install, so the wire format always matches.
+    """
+    if msgpack is None:
+        return {}
+    if not (_supports_serializer(sio_module.Server)
+            and _supports_serializer(sio_module.Client)):
+        return {}
+
+    class MsgpackPacket(sio_module.packet.Packet):
+        """Msgpack-framed socketio packet.
+
+        Binary framing removes the per-emit json.dumps cost and the
+        escape scanning of the default codec, and ndarray payloads
+        travel as raw bytes via the ext type above.
+        """
+
+        uses_binary_events = False
+
+        def encode(self):
+            """Encode the packet for transmission."""
+            as_dict = {'type': self.packet_type, 'nsp': self.namespace}
+            if self.data is not None:
+                as_dict['data'] = self.data
+            if self.id is not None:
+                as_dict['id'] = self.id
+            return msgpack.packb(as_dict, use_bin_type=True,
+                                 default=_msgpack_default)
+
+        def decode(self, encoded_packet):
+            """Decode a transmitted packet."""
+            decoded = msgpack.unpackb(encoded_packet, raw=False,
+                                      ext_hook=_msgpack_ext_hook)
+            self.packet_type = decoded['type']
+            self.data = decoded.get('data')
+            self.id = decoded.get('id')
+            self.namespace = decoded['nsp']
+
+    return {"serializer": MsgpackPacket}
+
+
+_SERIALIZER_KWARGS = {}
+
+
+def _import_socketio():
+    """Import socketio on first use and pick the packet codec once."""
+    global socketio, _SERIALIZER_KWARGS
+    if socketio is None:
+        socketio = importlib.import_module("socketio")
+        _SERIALIZER_KWARGS = _build_serializer_kwargs(socketio)
+    return socketio
+
+
+def _import_flask():
+    """Import Flask on first use (Master only)."""
+    global Flask
+    if Flask is None:
+        Flask = importlib.import_module("flask").Flask
+    return Flask
+
+
 class Master(threading.Thread):
     """Socket-IO Master class."""
 
     def __init__(self, host="0.0.0.0", port=5000, debug=False):
         """Init."""
-        super(Master, self).__init__()
-        self.setDaemon(True)
+        super(Master, self).__init__(daemon=True)
         self.__host = host
         self.__port = port
         self.__debug = debug
@@ -32,19 +171,52 @@ class Master(threading.Thread):
         if not self.__debug:
             self._logger_disable()
 
-        self.sio = socketio.Server(async_mode="threading",
-                                   logger=self.__debug,
-                                   cors_allowed_origins="*")
-        self.__app = Flask(__name__)
-        self.__app.wsgi_app = socketio.WSGIApp(self.sio,
-                                               self.__app.wsgi_app)
+        sio_module = _import_socketio()
+        flask_cls = _import_flask()
+
+        # eventlet green threads instead of one OS thread per client;
+        # this also enables the WebSocket transport, so steady traffic
+        # is frames on one connection rather than long-polling round
+        # trips. Hosts where eventlet cannot load fall back to
+        # threading mode and a non-eventlet server in run().
+        try:
+            self.sio = sio_module.Server(async_mode="eventlet",
+                                         logger=self.__debug,
+                                         cors_allowed_origins="*",
+                                         **_SERIALIZER_KWARGS)
+        except ValueError:
+            self.sio = sio_module.Server(async_mode="threading",
+                                         logger=self.__debug,
+                                         cors_allowed_origins="*",
+                                         **_SERIALIZER_KWARGS)
+        self.__app = flask_cls(__name__)
+        self.__app.wsgi_app = sio_module.WSGIApp(self.sio,
+                                                 self.__app.wsgi_app)
+
+        def _on_connect(sid, environ):
+            sock = None
+            eventlet_input = environ.get("eventlet.input")
+            if eventlet_input is not None:
+                try:
+                    sock = eventlet_input.get_socket()
+                except AttributeError:
+                    sock = None
+            if sock is None:
+                sock = environ.get("werkzeug.socket")
+            if sock is not None:
+                _set_nodelay(sock)
+
+        self.sio.on("connect", _on_connect)
 
     @staticmethod
     def _logger_disable():
         """Disable socketio info logging."""
+        if _SILENCED["master"]:
+            return
         logging.getLogger('socketio.server').setLevel(logging.ERROR)
         logging.getLogger('engineio.server').setLevel(logging.ERROR)
         logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        _SILENCED["master"] = True
 
     def update(self):
         """Update."""
@@ -54,52 +226,250 @@ class Master(threading.Thread):
         """Change host and port."""
         pass
 
+    def ready_wait(self, timeout=30):
+        """Wait until the server socket accepts connections.
+
+        Probes the listen port with connect_ex and exponential
+        backoff starting at 1ms, so startup continues as soon as the
+        server is actually up instead of after a blind sleep.
+        """
+        host = self.__host
+        if host in ("", "0.0.0.0"):
+            host = "127.0.0.1"
+
+        deadline = time.monotonic() + timeout
+        delay = 0.001
+        while time.monotonic() < deadline:
+            with socket.socket() as probe:
+                probe.settimeout(max(delay, 0.05))
+                if probe.connect_ex((host, self.__port)) == 0:
+                    return True
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+        return False
+
     def run(self):
         """Start server."""
-        os.environ["WERKZEUG_RUN_MAIN"] = "true"
-        self.__app.run(threaded=True)
+        if self.sio.async_mode != "eventlet":
+            self._run_fallback()
+            return
+
+        import eventlet
+        import eventlet.wsgi
+
+        listener = eventlet.listen((self.__host, self.__port))
+        eventlet.wsgi.server(listener, self.__app,
+                             log_output=self.__debug)
+
+    def _run_fallback(self):
+        """Serve without eventlet.
+
+        waitress is preferred when importable: it polls with epoll and
+        has no FD_SETSIZE cap, unlike the select-based Werkzeug dev
+        server, which is kept only as the last resort.
+        """
+        try:
+            from waitress import serve
+        except ImportError:
+            LOGGER.warning("eventlet and waitress are unavailable; "
+                           "falling back to the Werkzeug dev server.")
+            self.__app.run(host=self.__host, port=self.__port,
+                           threaded=True)
+            return
+
+        serve(self.__app, host=self.__host, port=self.__port,
+              threads=32)
 
 
 class Worker:
     """Socket-IO Worker class."""
 
-    def __init__(self, host="127.0.0.1", port=5000, debug=False):
-        """Init."""
-        self.__host = host
-        self.__port = port
+    def __init__(self, host="127.0.0.1", port=5000, debug=False,
+                 connections=1, allow_polling=False):
+        """Init.
+
+        connections > 1 opens that many parallel connections to the
+        master and rotates outbound emits across them, so one slow
+        write no longer serializes every other emit. Inbound events
+        stay on the first (listener) connection to preserve per-event
+        ordering; cross-connection emit ordering is not guaranteed.
+
+        By default only the WebSocket transport is negotiated, so
+        steady traffic is one frame per event instead of the POST+GET
+        pair of the long-polling fallback; any proxy in between must
+        permit the Upgrade handshake. allow_polling=True restores the
+        transport negotiation for debugging.
+        """
+        self._set_target(host, port)
         self.__debug = debug
         self.__start = False
 
+        # the websocket-only default needs the websocket-client
+        # package; without it engineio skips the transport with only
+        # a warning and connect returns unconnected, so degrade to
+        # polling loudly rather than fail silently
+        if not allow_polling:
+            try:
+                importlib.import_module("websocket")
+            except ImportError:
+                LOGGER.warning("websocket-client is not installed; "
+                               "falling back to long polling.")
+                allow_polling = True
+        self._transports = None if allow_polling else ["websocket"]
+
         if not self.__debug:
             self._logger_disable()
 
-        self.sio = socketio.Client(logger=self.__debug, binary=True)
+        sio_module = _import_socketio()
+        self.sio = sio_module.Client(logger=self.__debug, binary=True,
+                                     **_SERIALIZER_KWARGS)
+
+        # readiness is signalled by the connection events, so waiters
+        # block on the event instead of polling the transport state
+        self._ready = threading.Event()
+        self.sio.on("connect", self._ready.set)
+        self.sio.on("disconnect", self._ready.clear)
+
+        # outbound connection pool; the listener is member zero
+        self._pool = [self.sio]
+        for _ in range(max(0, connections - 1)):
+            self._pool.append(sio_module.Client(logger=self.__debug,
+                                                binary=True,
+                                                **_SERIALIZER_KWARGS))
+        self._rr = itertools.cycle(self._pool)
+
+    def next_client(self):
+        """Return the next outbound client in round-robin order."""
+        return next(self._rr)
+
+    def _set_target(self, host, port):
+        """Cache the connection URL with the host resolved once.
+
+        The hostname is resolved to an IP literal here so the
+        reconnect path (and a flapping worker redialing in a loop)
+        does not repeat the DNS lookup per attempt; an unresolvable
+        host falls back to the name and lets connect report it.
+        """
+        self.__host = host
+        self.__port = port
+        url_host = host
+        try:
+            info = socket.getaddrinfo(host, port, socket.AF_INET,
+                                      socket.SOCK_STREAM)
+            self._addr = info[0][4]
+            url_host = self._addr[0]
+        except OSError:
+            self._addr = None
+        self._url = 'http://{0}:{1}'.format(url_host, port)
+
+    def ready_wait(self, timeout=30):
+        """Wait until the client connection is established."""
+        return self._ready.wait(timeout)
+
+    def _connect(self, client):
+        """Connect one pool member.
+
+        A refused websocket-only handshake (a master on the
+        non-eventlet fallback server cannot upgrade, nor can a proxy
+        that blocks Upgrade) downgrades this worker to transport
+        negotiation with a warning and redials, instead of leaving
+        the two defaults mutually unconnectable.
+        """
+        try:
+            client.connect(self._url, transports=self._transports)
+        except socketio.exceptions.ConnectionError:
+            if self._transports is None:
+                raise
+            LOGGER.warning("WebSocket connection failed; retrying "
+                           "with transport negotiation.")
+            self._transports = None
+            client.connect(self._url)
 
     @staticmethod
     def _logger_disable():
         """Disable socketio info logging."""
+        if _SILENCED["worker"]:
+            return
         logging.getLogger('socketio.client').setLevel(logging.ERROR)
         logging.getLogger('engineio.client').setLevel(logging.ERROR)
+        _SILENCED["worker"] = True
 
     def update(self):
-        """Update connection."""
+        """Update connection.
+
+        Kept as a compatibility no-op. Handler registration no longer
+        recycles the transport; use reconnect() when the connection
+        genuinely must be rebuilt.
+        """
+        pass
+
+    def reconnect(self):
+        """Tear down and rebuild every pooled connection."""
         if self.__start:
-            if self.sio.eio.state != "disconnected":
-                self.sio.disconnect()
-            self.sio.connect('http://{0}:{1}'.format(self.__host, self.__port))
+            for client in self._pool:
+                if client.eio.state != "disconnected":
+                    client.disconnect()
+                self._connect(client)
             LOGGER.info("Connection is updated.")
 
     def change_host(self, host, port):
         """Change master."""
-        self.__host = host
-        self.__port = port
-        self.update()
+        self._set_target(host, port)
+        self.reconnect()
+
+    def _supervise(self):
+        """Keep the listener connection alive.
+
+        One daemon thread blocks in sio.wait, which only returns once
+        the connection drops, then reconnects with exponential backoff
+        capped at 30 seconds. Deliberate rebuilds via reconnect() are
+        left alone: the supervisor only dials when the connection is
+        actually down.
+        """
+        attempt = 0
+        while True:
+            self.sio.wait()
+            if not self.__start:
+                return
+            while self.__start and self.sio.eio.state != "connected":
+                try:
+                    self._connect(self.sio)
+                except socketio.exceptions.ConnectionError:
+                    time.sleep(min(2 ** attempt, 30))
+                    attempt += 1
+                    continue
+                # connect can also return without raising yet leave
+                # the transport unconnected (for instance when a
+                # transport is unavailable); back off the same way
+                # instead of spinning on immediate redials
+                if self.sio.eio.state != "connected":
+                    time.sleep(min(2 ** attempt, 30))
+                    attempt += 1
+                    continue
+                attempt = 0
 
     def start(self):
         """Start connection."""
-        self.sio.connect('http://{0}:{1}'.format(self.__host, self.__port))
-        self.sio.start_background_task(self.sio.wait)
+        self._connect(self.sio)
+
+        # bring the extra outbound connections up in parallel
+        threads = [threading.Thread(target=self._connect,
+                                    args=(client, ), daemon=True)
+                   for client in self._pool[1:]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
         self.__start = True
+        self._waiter = threading.Thread(target=self._supervise,
+                                        daemon=True)
+        self._waiter.start()
+
+        for client in self._pool:
+            sock = _transport_socket(client.eio)
+            if sock is not None:
+                _set_nodelay(sock)
 
 
 
@@ -117,36 +487,56 @@ class Bus:
 
     :param host: The host name.
     :param port: The port number.
+    :param connections: Worker only; size of the outbound connection
+                        pool (see Worker).
+    :param allow_polling: Worker only; permit the long-polling
+                          transport (see Worker).
 
     """
 
-    def __init__(self, node_type, host="127.0.0.1", port=5000, debug=False):
+    def __init__(self, node_type, host="127.0.0.1", port=5000, debug=False,
+                 connections=1, allow_polling=False):
         """Init."""
         self.node_type = node_type
         if self.node_type == "master":
             self.__bus = Master(host, port, debug=debug)
         elif self.node_type == "worker":
-            self.__bus = Worker(host, port, debug=debug)
+            self.__bus = Worker(host, port, debug=debug,
+                                connections=connections,
+                                allow_polling=allow_polling)
         else:
             raise ValueError("Node type must be master or worker.")
 
         self.sio = self.__bus.sio
 
-    def _ready_wait(self):
+    def _ready_wait(self, timeout=30):
         """Wait for the connection."""
         LOGGER.info("Stand-by for commencement of life cycle.")
-        if self.node_type == "worker":
-            while self.sio.eio.state != "connected":
-                time.sleep(0.05)
-        else:
-            time.sleep(2)
+        if not self.__bus.ready_wait(timeout):
+            LOGGER.warning("Bus is not ready after %s seconds.", timeout)
 
     def update(self):
         """Update connection."""
         self.__bus.update()
 
+    def reconnect(self):
+        """Rebuild the underlying transport connection."""
+        reconnect = getattr(self.__bus, "reconnect", None)
+        if reconnect is not None:
+            reconnect()
+
+    def _emit_client(self):
+        """Return the client to use for the next outbound emit."""
+        next_client = getattr(self.__bus, "next_client", None)
+        if next_client is not None:
+            return next_client()
+        return self.sio
+
     def up(self):
         """Activate bus."""
+        setup = getattr(self, "setup", None)
+        if setup is not None:
+            setup()
         self.__bus.start()
         self._ready_wait()
         LOGGER.info("Commencing(%s)", self.node_type)
@@ -155,6 +545,38 @@ class Bus:
         """Deactivate bus."""
         pass
 
+    def emit_batch(self, events):
+        """Emit a burst of events as one kernel write where possible.
+
+        events is an iterable of (event, data) or (event, data,
+        namespace) tuples passed to the subclass emit. On Linux the
+        transport socket is corked around the loop so the frames
+        leave in as few segments as the kernel can manage; elsewhere
+        (or when the raw socket is unreachable) the loop still runs,
+        just uncorked.
+        """
+        sock = None
+        if sys.platform.startswith("linux"):
+            sock = _transport_socket(self.sio.eio)
+
+        corked = False
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+                corked = True
+            except (OSError, AttributeError):
+                pass
+        try:
+            for event in events:
+                self.emit(*event)
+        finally:
+            if corked:
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP,
+                                    socket.TCP_CORK, 0)
+                except (OSError, AttributeError):
+                    pass
+
 class BusMaster(Bus):
     """Bus master node.
 
@@ -167,22 +589,105 @@ class BusMaster(Bus):
         super(BusMaster, self).__init__("master", host, port, debug=debug)
 
         self.namespaces = set()
+        self.routes = {}
+        self._relays = {}
+        self._setup_done = False
+
+    def setup(self):
+        """Register the bus control handlers.
+
+        Construction stays free of registration side effects; up()
+        calls this before the server starts, and calling it again is
+        a no-op, so explicit early setup is also safe.
+        """
+        if self._setup_done:
+            return
         self._regist_events()
+        self._setup_done = True
 
     def _regist_events(self):
-        pass
-
-    def append_relay(self, namespace, in_name, out_name=None):
-        """Append client to client relay."""
+        # workers announce handler changes over their open socket
+        # instead of reconnecting; track them per (namespace, event)
+        def _register(sid, data):
+            key = (data.get("namespace"), data.get("event"))
+            if data.get("op") == "on":
+                self.routes.setdefault(key, set()).add(sid)
+            else:
+                sids = self.routes.get(key)
+                if sids is not None:
+                    sids.discard(sid)
+                    if not sids:
+                        del self.routes[key]
+
+        self.sio.on("_register", _register)
+
+    def append_relay(self, namespace, in_name, out_name=None,
+                     batch_window=None, max_batch=100):
+        """Append client to client relay.
+
+        By default every inbound event is forwarded as-is. With
+        batch_window (seconds) set, inbound events are instead queued
+        and a background task flushes them once per window as a
+        single list payload under out_name, so a high-rate stream
+        costs one frame per window instead of one per message.
+        Clients of a batched relay unpack the list, and batched
+        emits go to the whole namespace (no skip_sid), so senders
+        also receive the batches.
+        """
         if out_name is None:
             out_name = in_name
 
-        handler = (lambda sid, data:
-                   self.sio.emit(out_name,
-                                 data,
-                                 namespace=namespace,
-                                 skip_sid=sid))
-
+        if (namespace, in_name) in self._relays:
+            LOGGER.info("Relay %s on %s already registered.",
+                        in_name, namespace)
+            return
+
+        # every client on a relayed namespace joins the relay room at
+        # connect time, so relay emits address the room directly
+        # instead of scanning the whole namespace per message; the
+        # previous connect handler (if any) is chained
+        if namespace not in self.namespaces:
+            prev = self.sio.handlers.get(namespace, {}).get("connect")
+
+            def _join(sid, environ, _prev=prev,
+                      _enter=self.sio.enter_room, _ns=namespace):
+                _enter(sid, "relay", namespace=_ns)
+                if _prev is not None:
+                    return _prev(sid, environ)
+                return None
+
+            self.sio.on("connect", _join, namespace=namespace)
+
+        if batch_window is None or max_batch <= 1:
+            # emit and the forwarding parameters are bound as default
+            # arguments once, so the per-message path runs on fast
+            # locals with no attribute chain or closure-cell loads
+            def handler(sid, data, _emit=self.sio.emit,
+                        _out=out_name, _ns=namespace):
+                _emit(_out, data, room="relay", namespace=_ns,
+                      skip_sid=sid)
+        else:
+            pending = deque()
+
+            def handler(sid, data):
+                pending.append(data)
+
+            def flusher():
+                while True:
+                    self.sio.sleep(batch_window)
+                    if not pending:
+                        continue
+                    batch = [pending.popleft()
+                             for _ in range(min(len(pending),
+                                                max_batch))]
+                    self.sio.emit(out_name, batch, room="relay",
+                                  namespace=namespace)
+
+            self.sio.start_background_task(flusher)
+
+        # authoritative relay registry; dedup above and O(1) removal
+        # both key off this dict rather than socketio internals
+        self._relays[(namespace, in_name)] = handler
         self.sio.on(in_name, handler, namespace=namespace)
         self.namespaces.add(namespace)
 
@@ -190,7 +695,14 @@ class BusMaster(Bus):
                     in_name, out_name, namespace)
 
     def remove_relay(self, namespace, in_name):
-        """Remove relay."""
+        """Remove relay.
+
+        The relay dict is the authoritative registry: a missing key
+        returns immediately without touching socketio's internal
+        handler map.
+        """
+        if self._relays.pop((namespace, in_name), None) is None:
+            return
         self.sio.on(in_name, None, namespace=namespace)
         LOGGER.info("Remove relay %s on %s", in_name, namespace)
 
@@ -204,9 +716,15 @@ class BusMaster(Bus):
         self.sio.on(event, None, namespace=namespace)
         LOGGER.info("Unregist event %s on %s.", event, namespace)
 
-    def emit(self, event, data=None, namespace=None):
+    def emit(self, event, data=None, namespace=None, callback=None):
         """Emit."""
-        self.sio.emit(event, data, namespace=namespace)
+        # no-callback fast path: the common tight-loop emits skip the
+        # extra keyword entirely
+        if callback is None:
+            self.sio.emit(event, data, namespace=namespace)
+        else:
+            self.sio.emit(event, data, namespace=namespace,
+                          callback=callback)
 
 
 class BusWorker(Bus):
@@ -216,11 +734,30 @@ class BusWorker(Bus):
     Worker nodes are used by connecting to the master node.
     """
 
-    def __init__(self, host="127.0.0.1", port=5000, debug=False):
+    def __init__(self, host="127.0.0.1", port=5000, debug=False,
+                 connections=1, allow_polling=False):
         """Init."""
-        super(BusWorker, self).__init__("worker", host, port, debug=debug)
+        super(BusWorker, self).__init__("worker", host, port, debug=debug,
+                                        connections=connections,
+                                        allow_polling=allow_polling)
         self.namespace = None
 
+    def _notify_register(self, op, event, namespace):
+        """Announce a handler change to the master.
+
+        One lightweight control event on the already-open socket
+        replaces the old full disconnect/reconnect handshake per
+        registration. Failures (for instance before the first
+        connect) are ignored; the registration still takes effect
+        locally.
+        """
+        try:
+            self.sio.emit("_register", {"op": op,
+                                        "event": event,
+                                        "namespace": namespace})
+        except socketio.exceptions.SocketIOError:
+            pass
+
     def on(self, event, handler, namespace=None):
         """On."""
         if namespace is None:
@@ -228,7 +765,7 @@ class BusWorker(Bus):
 
         self.sio.on(event, handler, namespace=namespace)
         LOGGER.info("Regist %s on %s.", event, namespace)
-        self.update()
+        self._notify_register("on", event, namespace)
 
     def off(self, event, namespace=None):
         """Off."""
@@ -237,12 +774,16 @@ class BusWorker(Bus):
 
         self.sio.on(event, None, namespace=namespace)
         LOGGER.info("Unregist %s on %s.", event, namespace)
-        self.update()
+        self._notify_register("off", event, namespace)
 
     def set_namespace(self, namespace):
-        """Set client namespace."""
+        """Set client namespace.
+
+        A namespace change is negotiated at connect time, so this is
+        the one case that still rebuilds the connection.
+        """
         self.namespace = namespace
-        self.update()
+        self.reconnect()
         LOGGER.info("Append namespace: %s.", self.namespace)
 
     def emit(self, event, data=None, namespace=None, callback=None):
@@ -252,7 +793,45 @@ class BusWorker(Bus):
         """
         if namespace is None:
             namespace = self.namespace
-        self.sio.emit(event, data, namespace=namespace, callback=callback)
+        # no-callback fast path, as in BusMaster.emit
+        if callback is None:
+            self._emit_client().emit(event, data, namespace=namespace)
+        else:
+            self._emit_client().emit(event, data, namespace=namespace,
+                                     callback=callback)
+
+    def call(self, event, data=None, namespace=None, timeout=10):
+        """Emit and block until the master acknowledges.
+
+        Request/response in one call instead of hand-rolled callback
+        plumbing. Delegates to the native sio.call when the installed
+        socketio provides it; otherwise the acknowledgement is waited
+        on with an event, with the same return convention (None, a
+        single value, or a tuple) and a TimeoutError on expiry.
+        """
+        if namespace is None:
+            namespace = self.namespace
+
+        call = getattr(self.sio, "call", None)
+        if call is not None:
+            return call(event, data, namespace=namespace,
+                        timeout=timeout)
+
+        done = threading.Event()
+        result = []
+
+        def _ack(*args):
+            result.append(args)
+            done.set()
+
+        self.sio.emit(event, data, namespace=namespace, callback=_ack)
+        if not done.wait(timeout):
+            raise getattr(socketio.exceptions, "TimeoutError",
+                          TimeoutError)()
+        args = result[0]
+        if not args:
+            return None
+        return args[0] if len(args) == 1 else args
 
 
 if __name__ == '__main__':
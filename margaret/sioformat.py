@@ -24,10 +24,14 @@ class DefaultConnectionEvents:
             LOGGER.info(message)
 
         def broadcast(sid, data):
-            # Broadcast specific emit to all clients
-            print("broadcast", data["emitName"])
+            # Broadcast specific emit to all clients. The payload is
+            # relayed as the second argument of a multi-argument emit
+            # rather than wrapped in a fresh dict, so bytes payloads
+            # stay binary frames and nothing is re-encoded per client.
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug("broadcast %s", data["emitName"])
             bus.emit(data["emitName"],
-                     {"id": sid, "payload": data["payload"]},
+                     (sid, data["payload"]),
                      namespace)
 
         bus.on('connect', connect, namespace)